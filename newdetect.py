@@ -2,43 +2,82 @@ import os
 import hashlib
 import time
 import re
+import stat
+import functools
+import statistics
 import threading
+import queue
 import tkinter as tk
 from tkinter import messagebox
 import sys
-from datetime import datetime
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from watchdog.observers import Observer
+import watchdog.events
 from watchdog.events import FileSystemEventHandler
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import json
+import csv
 import webbrowser
 from pathlib import Path
 import urllib.parse
 import subprocess
 import sqlite3
 from typing import Dict, List, Tuple, Optional
+from string import Template
+from difflib import SequenceMatcher
 import base64
 import io
+import gzip
+import zlib
+import pickle
+
+# inotify reports IN_CLOSE_WRITE as a FileClosedEvent (watchdog 2.1+, Linux only), which
+# tells us the writer is done without polling the file size
+CLOSE_EVENTS_AVAILABLE = hasattr(watchdog.events, 'FileClosedEvent') and sys.platform.startswith('linux')
 
 # Advanced libraries for duplicate detection
+try:
+    import numpy as np  # Shared by the image, audio, video and index backends
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 try:
     from PIL import Image  # Remove ImageHash from this line
-    import imagehash
+    import imagehash  # Requires numpy
     PIL_AVAILABLE = True
 except ImportError:
     PIL_AVAILABLE = False
+
+try:
+    from libphash import ImageContext  # Native pHash/aHash/dHash/wHash from a single decode
+    LIBPHASH_AVAILABLE = NUMPY_AVAILABLE  # Batched Hamming distances need numpy
+except ImportError:
+    LIBPHASH_AVAILABLE = False
+
+# Either backend can hash images, and the stored hashes are interchangeable
+IMAGE_HASH_AVAILABLE = PIL_AVAILABLE or LIBPHASH_AVAILABLE
+if not IMAGE_HASH_AVAILABLE:
     print("⚠️  PIL/Pillow not available. Image similarity detection disabled.")
     print("   Install with: pip install Pillow imagehash")
 
 try:
     import librosa
-    import numpy as np
     LIBROSA_AVAILABLE = True
 except ImportError:
     LIBROSA_AVAILABLE = False
     print("⚠️  librosa not available. Audio fingerprinting disabled.")
     print("   Install with: pip install librosa")
 
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+    print("⚠️  faiss not available. Using linear similarity search.")
+    print("   Install with: pip install faiss-cpu")
+
 try:
     import cv2
     CV2_AVAILABLE = True
@@ -64,7 +103,6 @@ except ImportError:
     print("   Install with: pip install PyMuPDF")
 
 try:
-    from difflib import SequenceMatcher
     import docx
     DOCX_AVAILABLE = True
 except ImportError:
@@ -77,8 +115,18 @@ DOWNLOAD_DIR = r"C:\Users\Manoj\Downloads"
 HASH_STORE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "file_hashes.txt")
 MODIFICATION_DB_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "file_modifications.txt")
 ADVANCED_DB_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "advanced_duplicates.db")
+SIMILARITY_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "similarity_cache.pkl")
+SIMILARITY_CACHE_SIZE = 4096    # Most recently used content hashes kept with their similarity results
+STORE_SAVE_DELAY = 0.5          # Hash/modification store updates within this window share one write
+STORE_COMPACT_THRESHOLD = 10000 # Appended changes before the stores are rewritten from scratch
+STATS_REFRESH_EVENTS = 50       # Processed files between file type statistics refreshes
 WEB_SERVER_PORT = 8080
 
+# Content hashing: SHA-256 is hardware accelerated (SHA-NI / ARMv8) by OpenSSL
+HASH_BLOCK_SIZE = 1024 * 1024    # Large reads amortize per-call overhead
+HASH_HEX_LENGTH = 64             # Entries of another length are from the old MD5 stores
+HASH_WORKERS = min(8, os.cpu_count() or 1)  # hashlib releases the GIL, so files hash in parallel
+
 # Advanced detection configuration
 SIMILARITY_THRESHOLDS = {
     'image_hash': 10,      # Lower = more similar (0-64)
@@ -88,40 +136,164 @@ SIMILARITY_THRESHOLDS = {
     'fuzzy_similarity': 80     # Higher = more similar (0-100)
 }
 
+# Audio fingerprint configuration (pooled features over a short window)
+AUDIO_SAMPLE_SECONDS = 6
+AUDIO_SAMPLE_RATE = 16000
+AUDIO_MFCC_COEFFS = 20
+
+# Video signature configuration (frame positions as a fraction of the video length)
+VIDEO_SAMPLE_POSITIONS = (0.1, 0.3, 0.5, 0.7, 0.9)
+VIDEO_BLANK_FRAME_STD = 2.0     # Grayscale std-dev below which a frame counts as blank (black/flat colour)
+# Frame hashes that carry no content: the placeholder stored for blank or unreadable frames,
+# and the pHash that flat frames produced before blank frames were detected
+BLANK_FRAME_HASHES = frozenset({'0000000000000000', '8000000000000000'})
+BLANK_FRAME_HASH = '0000000000000000'
+
+# Approximate nearest-neighbour search configuration (FAISS HNSW)
+ANN_NEIGHBORS = 20        # Candidates returned per query
+HNSW_LINKS = 32           # Graph connectivity per node
+
 # File type categories
 IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp', '.ico', '.svg'}
 AUDIO_EXTENSIONS = {'.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma'}
 VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.wmv', '.flv', '.mkv', '.webm', '.m4v'}
 DOCUMENT_EXTENSIONS = {'.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt'}
 
-SUPPORTED_FILE_TYPES = IMAGE_EXTENSIONS | AUDIO_EXTENSIONS | VIDEO_EXTENSIONS | DOCUMENT_EXTENSIONS | {
+SUPPORTED_FILE_TYPES = frozenset(IMAGE_EXTENSIONS | AUDIO_EXTENSIONS | VIDEO_EXTENSIONS | DOCUMENT_EXTENSIONS | {
     '.xls', '.xlsx', '.ppt', '.pptx', '.zip', '.rar', '.7z', '.tar', '.gz'
-}
+})
 
 # File size filtering (in bytes)
 MIN_FILE_SIZE = 1024  # 1KB
 MAX_FILE_SIZE = 500 * 1024 * 1024  # 500MB
 
+# Watchdog event batching (in seconds)
+EVENT_DEBOUNCE_SECONDS = 0.75   # Quiet period before a burst of events is processed
+EVENT_MAX_BATCH_DELAY = 5.0     # Upper bound on how long a busy burst can postpone processing
+CLOSE_EVENT_TIMEOUT = 2.0       # Write inactivity after which a created file stops waiting for its close event
+
 # Ignored file patterns
-IGNORED_EXTENSIONS = {'.tmp', '.temp', '.crdownload', '.part', '.download', '.partial'}
-IGNORED_NAME_PATTERNS = [r'^~\$', r'^\.', r'Thumbs\.db$']
+IGNORED_EXTENSIONS = frozenset({'.tmp', '.temp', '.crdownload', '.part', '.download', '.partial'})
+IGNORED_NAME_PATTERNS = [r'^~\$', r'^\.', r'thumbs\.db$']
 EXCLUDED_PATTERNS = [r'^desktop\.ini$', r'^folder\.jpg$', r'^thumbs\.db$']
 
+# Excluded and ignored name patterns fused into one regex with a named group per pattern,
+# so a single search both rejects the file and reports which pattern matched.
+# Patterns are lowercase and matched against the lowercased filename.
+FILTER_PATTERNS = EXCLUDED_PATTERNS + IGNORED_NAME_PATTERNS
+FILTER_RE = re.compile('|'.join(
+    f'(?P<p{index}>{pattern})' for index, pattern in enumerate(FILTER_PATTERNS)
+))
+
+# Suffixes stripped from filenames before comparing them for similarity
+DUPLICATE_PATTERNS = [
+    r'\s*\(\d+\)',      # Matches " (1)", " (2)", etc.
+    r'\s*-\s*copy',     # Matches " - copy"
+    r'\s*_copy',        # Matches "_copy"
+    r'\s*-\s*v\d+\)',   # Matches " - v1)", " - v2)", etc.
+    r'\s*_v\d+\)',      # Matches "_v1)", "_v2)", etc.
+    r'\s*-\s*\d+',      # Matches " - 1", " - 2", etc.
+    r'\s*_\d+',         # Matches "_1", "_2", etc.
+    r'\s*-\s*duplicate', # Matches " - duplicate"
+    r'\s*_duplicate',    # Matches "_duplicate"
+    r'\s+copy',         # Matches " copy" (with spaces)
+]
+
+# All duplicate suffixes fused into one alternation so a single sub() pass cleans a name.
+# Names are lowercased before matching, so the pattern is case-sensitive and ASCII-only.
+COMBINED_DUP_RE = re.compile('(?:' + '|'.join(DUPLICATE_PATTERNS) + ')', re.ASCII)
+
+def build_extension_metadata():
+    """Map each supported extension to its (type class, detection methods) for the dashboard"""
+    categories = [
+        (IMAGE_EXTENSIONS, "image", "pHash", IMAGE_HASH_AVAILABLE),
+        (AUDIO_EXTENSIONS, "audio", "Audio", LIBROSA_AVAILABLE),
+        (VIDEO_EXTENSIONS, "video", "Thumb", CV2_AVAILABLE),
+        (DOCUMENT_EXTENSIONS, "document", "Content", PYMUPDF_AVAILABLE),
+    ]
+    
+    ext_meta = {}
+    for file_ext in SUPPORTED_FILE_TYPES:
+        type_class = "other"
+        detection_methods = ["SHA-256"]
+        for extensions, category, method, available in categories:
+            if file_ext in extensions:
+                type_class = category
+                if available:
+                    detection_methods.append(method)
+                break
+        if SSDEEP_AVAILABLE:
+            detection_methods.append("Fuzzy")
+        ext_meta[file_ext] = (type_class, " + ".join(detection_methods))
+    return ext_meta
+
+# Extension metadata is fixed at startup since the *_AVAILABLE flags don't change
+EXT_META = build_extension_metadata()
+DEFAULT_EXT_META = ("other", "SHA-256 + Fuzzy" if SSDEEP_AVAILABLE else "SHA-256")
+
 # Global variables
-file_type_stats = {}
+file_type_stats = Counter()
+file_category_stats = Counter()  # Files per EXT_META type class, plus 'total'
 web_server = None
 web_server_thread = None
 
+# Modal alerts are shown on the main thread through one long-lived hidden Tk root
+_tk_root = None
+_alert_queue = queue.Queue()
+
+# Rendered stats page body (everything above the footer), reused until the download
+# directory, the files in it or the advanced DB counts change
+_cached_html = None
+_cached_total_files = 0
+_cached_dir_mtime = None
+_cached_files_sig = None
+_cached_advanced_stats_sig = None
+_cached_gzip_source = None
+_cached_gzip_prefix = None
+_cached_gzip_compressor = None
+
+# Guards the stats page caches now that requests are served on concurrent threads
+_stats_lock = threading.Lock()
+
+def hamming_all(phashes, query):
+    """Hamming distance from a 64-bit query hash to every hash in a uint64 array"""
+    diff = phashes ^ query
+    if hasattr(np, 'bitwise_count'):
+        # NumPy 2.0+: hardware popcount per element
+        return np.bitwise_count(diff).astype(np.int32)
+    # SWAR popcount for older NumPy: sum bits in 2-, 4- then 8-bit lanes, then add the bytes
+    diff = diff - ((diff >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    diff = (diff & np.uint64(0x3333333333333333)) + ((diff >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    diff = (diff + (diff >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((diff * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int32)
+
+def get_ssdeep_block_size(fuzzy_hash):
+    """Extract the block size prefix from an ssdeep hash ('blocksize:hash1:hash2')"""
+    try:
+        return int(fuzzy_hash.split(':', 1)[0])
+    except (ValueError, AttributeError):
+        return None
+
 class AdvancedDuplicateDetector:
     """Advanced duplicate detection using various techniques"""
     
     def __init__(self):
+        # file_path -> (file_size, modification_time) of the last stored fingerprints
+        self.fingerprint_cache = {}
+        # Bumped whenever fingerprints are written, so cached query results can be invalidated
+        self.fingerprint_generation = 0
         self.init_database()
+        self.build_similarity_indexes()
         
     def init_database(self):
         """Initialize SQLite database for advanced duplicate detection"""
         try:
-            self.conn = sqlite3.connect(ADVANCED_DB_FILE)
+            # Shared with the event batch thread and the dashboard threads (sqlite serializes access)
+            self.conn = sqlite3.connect(ADVANCED_DB_FILE, check_same_thread=False)
+            # WAL lets dashboard reads run alongside writes; NORMAL sync is durable enough in WAL mode
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.execute('PRAGMA mmap_size=268435456')
             self.cursor = self.conn.cursor()
             
             # Create tables for different types of fingerprints
@@ -140,7 +312,7 @@ class AdvancedDuplicateDetector:
             self.cursor.execute('''
                 CREATE TABLE IF NOT EXISTS audio_fingerprints (
                     file_path TEXT PRIMARY KEY,
-                    spectral_centroid BLOB,
+                    spectral_centroid REAL,
                     mfcc_features BLOB,
                     tempo REAL,
                     duration REAL,
@@ -149,6 +321,10 @@ class AdvancedDuplicateDetector:
                 )
             ''')
             
+            # Drop audio rows stored before fingerprints were pooled to mean MFCC vectors
+            self.cursor.execute('DELETE FROM audio_fingerprints WHERE length(mfcc_features) != ?',
+                                (AUDIO_MFCC_COEFFS * 4,))
+            
             self.cursor.execute('''
                 CREATE TABLE IF NOT EXISTS document_content (
                     file_path TEXT PRIMARY KEY,
@@ -171,15 +347,30 @@ class AdvancedDuplicateDetector:
                 )
             ''')
             
+            # Drop single-frame video rows stored before signatures sampled fixed positions
+            self.cursor.execute('DELETE FROM video_thumbnails WHERE length(thumbnail_hash) != ?',
+                                (16 * len(VIDEO_SAMPLE_POSITIONS),))
+            
             self.cursor.execute('''
                 CREATE TABLE IF NOT EXISTS fuzzy_hashes (
                     file_path TEXT PRIMARY KEY,
                     fuzzy_hash TEXT,
+                    block_size INTEGER,
                     file_size INTEGER,
                     modification_time REAL
                 )
             ''')
             
+            # Add and backfill the ssdeep block size column on databases created before it existed
+            self.cursor.execute('PRAGMA table_info(fuzzy_hashes)')
+            if 'block_size' not in [column[1] for column in self.cursor.fetchall()]:
+                self.cursor.execute('ALTER TABLE fuzzy_hashes ADD COLUMN block_size INTEGER')
+                self.cursor.execute('''
+                    UPDATE fuzzy_hashes
+                    SET block_size = CAST(substr(fuzzy_hash, 1, instr(fuzzy_hash, ':') - 1) AS INTEGER)
+                ''')
+            self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_fuzzy_prefix ON fuzzy_hashes(block_size)')
+            
             self.conn.commit()
             print("✅ Advanced duplicate detection database initialized")
             
@@ -188,6 +379,62 @@ class AdvancedDuplicateDetector:
             self.conn = None
             self.cursor = None
     
+    def build_similarity_indexes(self):
+        """Build in-memory ANN indexes over the stored image and audio fingerprints"""
+        self.img_index = None
+        self.audio_index = None
+        if not FAISS_AVAILABLE or not self.cursor:
+            return
+        
+        try:
+            # Image pHashes as 64-bit binary vectors (Hamming distance)
+            self.img_index = faiss.IndexBinaryHNSW(64, HNSW_LINKS)
+            self.img_index_paths = []   # index id -> file_path
+            self.img_index_ids = {}     # file_path -> latest index id
+            self.cursor.execute('SELECT file_path, perceptual_hash FROM image_hashes')
+            for stored_path, stored_hash in self.cursor.fetchall():
+                self.add_to_image_index(stored_path, stored_hash)
+            
+            # Mean MFCC vectors, L2-normalised so L2 distance ranks by cosine similarity
+            self.audio_index = faiss.IndexHNSWFlat(AUDIO_MFCC_COEFFS, HNSW_LINKS)
+            self.audio_index_paths = []
+            self.audio_index_ids = {}
+            self.audio_index_centroids = []
+            self.cursor.execute('SELECT file_path, spectral_centroid, mfcc_features FROM audio_fingerprints')
+            for stored_path, centroid, mfcc in self.cursor.fetchall():
+                self.add_to_audio_index(stored_path, centroid, mfcc)
+            
+            print(f"✅ Similarity indexes built ({self.img_index.ntotal} images, {self.audio_index.ntotal} audio)")
+            
+        except Exception as e:
+            print(f"❌ Error building similarity indexes: {e}")
+            self.img_index = None
+            self.audio_index = None
+    
+    def add_to_image_index(self, file_path: str, perceptual_hash: str):
+        """Add or refresh an image pHash in the ANN index"""
+        if self.img_index is None or not perceptual_hash or len(perceptual_hash) != 16:
+            return
+        
+        vector = np.frombuffer(bytes.fromhex(perceptual_hash), dtype=np.uint8).reshape(1, 8)
+        # HNSW can't remove entries; superseded ids are ignored at query time
+        self.img_index_ids[file_path] = len(self.img_index_paths)
+        self.img_index_paths.append(file_path)
+        self.img_index.add(vector)
+    
+    def add_to_audio_index(self, file_path: str, centroid, mfcc_features: bytes):
+        """Add or refresh an audio fingerprint in the ANN index"""
+        if self.audio_index is None or not isinstance(centroid, float) or not mfcc_features \
+                or len(mfcc_features) != AUDIO_MFCC_COEFFS * 4:
+            return
+        
+        vector = np.frombuffer(mfcc_features, dtype=np.float32).reshape(1, AUDIO_MFCC_COEFFS).copy()
+        faiss.normalize_L2(vector)
+        self.audio_index_ids[file_path] = len(self.audio_index_paths)
+        self.audio_index_paths.append(file_path)
+        self.audio_index_centroids.append(centroid)
+        self.audio_index.add(vector)
+    
     def close_database(self):
         """Close database connection"""
         if self.conn:
@@ -195,6 +442,19 @@ class AdvancedDuplicateDetector:
     
     def calculate_image_hashes(self, file_path: str) -> Optional[Dict]:
         """Calculate multiple image hashes for similarity detection"""
+        if LIBPHASH_AVAILABLE:
+            try:
+                # Decode once and compute all four hashes natively
+                with ImageContext(file_path) as ctx:
+                    return {
+                        'perceptual_hash': f"{ctx.phash:016x}",
+                        'average_hash': f"{ctx.ahash:016x}",
+                        'difference_hash': f"{ctx.dhash:016x}",
+                        'wavelet_hash': f"{ctx.whash:016x}"
+                    }
+            except Exception as e:
+                print(f"libphash failed for {file_path}, falling back to imagehash: {e}")
+        
         if not PIL_AVAILABLE:
             return None
             
@@ -227,18 +487,18 @@ class AdvancedDuplicateDetector:
             return None
             
         try:
-            # Load audio file
-            y, sr = librosa.load(file_path, duration=30)  # Load first 30 seconds
+            # Load a short mono window at a reduced sample rate
+            y, sr = librosa.load(file_path, duration=AUDIO_SAMPLE_SECONDS, sr=AUDIO_SAMPLE_RATE, mono=True)
             
-            # Extract features
-            spectral_centroid = librosa.feature.spectral_centroid(y=y, sr=sr)
-            mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
+            # Extract features pooled over time (only the means matter for similarity)
+            spectral_centroid = librosa.feature.spectral_centroid(y=y, sr=sr).mean()
+            mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=AUDIO_MFCC_COEFFS, hop_length=512)
             tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
             duration = librosa.get_duration(y=y, sr=sr)
             
             return {
-                'spectral_centroid': spectral_centroid.tobytes(),
-                'mfcc_features': mfcc.tobytes(),
+                'spectral_centroid': float(spectral_centroid),
+                'mfcc_features': mfcc.mean(axis=1).astype(np.float32).tobytes(),
                 'tempo': float(tempo),
                 'duration': float(duration)
             }
@@ -247,6 +507,12 @@ class AdvancedDuplicateDetector:
             print(f"Error calculating audio fingerprint for {file_path}: {e}")
             return None
     
+    def can_extract_document(self, file_ext: str) -> bool:
+        """Check whether extract_document_content supports this extension with the installed libraries"""
+        return ((file_ext == '.pdf' and PYMUPDF_AVAILABLE)
+                or (file_ext == '.docx' and DOCX_AVAILABLE)
+                or file_ext == '.txt')
+    
     def extract_document_content(self, file_path: str) -> Optional[str]:
         """Extract text content from documents"""
         file_ext = os.path.splitext(file_path)[1].lower()
@@ -261,7 +527,6 @@ class AdvancedDuplicateDetector:
                 return text.strip()
                 
             elif file_ext == '.docx' and DOCX_AVAILABLE:
-                import docx
                 doc = docx.Document(file_path)
                 text = ""
                 for paragraph in doc.paragraphs:
@@ -277,46 +542,81 @@ class AdvancedDuplicateDetector:
             
         return None
     
+    def calculate_frame_phash(self, frame) -> str:
+        """Calculate a 64-bit perceptual hash of a video frame as 16 hex characters"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if gray.std() < VIDEO_BLANK_FRAME_STD:
+            return BLANK_FRAME_HASH  # Black or flat-colour frame: no content to hash
+        small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+        low_freq = cv2.dct(small)[:8, :8]
+        bits = low_freq > np.median(low_freq)
+        return np.packbits(bits.flatten()).tobytes().hex()
+    
     def calculate_video_thumbnail_hash(self, file_path: str) -> Optional[str]:
-        """Extract video thumbnail and calculate its hash"""
+        """Sample frames across the video and calculate a multi-frame hash signature"""
         if not CV2_AVAILABLE:
             return None
             
         try:
-            cap = cv2.VideoCapture(file_path)
-            ret, frame = cap.read()
+            # Prefer the FFmpeg backend with hardware decoding where OpenCV supports it
+            if hasattr(cv2, 'CAP_PROP_HW_ACCELERATION'):
+                cap = cv2.VideoCapture(file_path, cv2.CAP_FFMPEG,
+                                       [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+            else:
+                cap = cv2.VideoCapture(file_path, cv2.CAP_FFMPEG)
+            if not cap.isOpened():
+                cap = cv2.VideoCapture(file_path)
             
-            if ret:
-                # Convert frame to PIL Image
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                img = Image.fromarray(frame_rgb)
-                
-                # Calculate hash
-                thumbnail_hash = str(imagehash.phash(img))
-                
-                # Get video info
-                fps = cap.get(cv2.CAP_PROP_FPS)
-                frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-                duration = frame_count / fps if fps > 0 else 0
-                
-                width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                
+            # Get video info
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+            duration = frame_count / fps if fps > 0 else 0
+            
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            
+            # Seek to several points instead of relying on the (often black) first frame.
+            # Every position gets a hash so signatures line up frame by frame; blank or
+            # unreadable frames get a placeholder that comparisons skip.
+            frame_hashes = []
+            if frame_count <= 0:
+                # Without a frame count there are no positions to line up against
                 cap.release()
-                
+                return None
+            for position in VIDEO_SAMPLE_POSITIONS:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, int(frame_count * position))
+                ret, frame = cap.read()
+                if ret:
+                    frame_hashes.append(self.calculate_frame_phash(frame))
+                else:
+                    frame_hashes.append(BLANK_FRAME_HASH)
+            
+            cap.release()
+            
+            if any(frame_hash not in BLANK_FRAME_HASHES for frame_hash in frame_hashes):
                 return {
-                    'thumbnail_hash': thumbnail_hash,
+                    'thumbnail_hash': ''.join(frame_hashes),
                     'duration': duration,
                     'resolution': f"{width}x{height}"
                 }
             
-            cap.release()
-            
         except Exception as e:
             print(f"Error extracting video thumbnail from {file_path}: {e}")
             
         return None
     
+    def video_signature_distance(self, signature1: str, signature2: str) -> float:
+        """Median Hamming distance between frame hashes taken at the same positions in two videos"""
+        hashes1 = [signature1[i:i + 16] for i in range(0, len(signature1), 16)]
+        hashes2 = [signature2[i:i + 16] for i in range(0, len(signature2), 16)]
+        # Blank frames (black intros, credits, flat colour) say nothing about the content
+        distances = [bin(int(hash1, 16) ^ int(hash2, 16)).count('1')
+                     for hash1, hash2 in zip(hashes1, hashes2)
+                     if hash1 not in BLANK_FRAME_HASHES and hash2 not in BLANK_FRAME_HASHES]
+        if not distances:
+            return 64.0  # No content frames to compare
+        return statistics.median(distances)
+    
     def calculate_fuzzy_hash(self, file_path: str) -> Optional[str]:
         """Calculate fuzzy hash (ssdeep) for similarity detection"""
         if not SSDEEP_AVAILABLE:
@@ -328,6 +628,40 @@ class AdvancedDuplicateDetector:
             print(f"Error calculating fuzzy hash for {file_path}: {e}")
             return None
     
+    def fingerprints_up_to_date(self, file_path: str, file_ext: str, file_size: int, mod_time: float) -> bool:
+        """Check whether stored fingerprints still match the file's size and modification time"""
+        if self.fingerprint_cache.get(file_path) == (file_size, mod_time):
+            return True
+        
+        # Only tables whose fingerprinting backend is available can hold a row
+        tables = []
+        if file_ext in IMAGE_EXTENSIONS:
+            if IMAGE_HASH_AVAILABLE:
+                tables.append('image_hashes')
+        elif file_ext in AUDIO_EXTENSIONS:
+            if LIBROSA_AVAILABLE:
+                tables.append('audio_fingerprints')
+        elif file_ext in DOCUMENT_EXTENSIONS:
+            if self.can_extract_document(file_ext):
+                tables.append('document_content')
+        elif file_ext in VIDEO_EXTENSIONS:
+            if CV2_AVAILABLE:
+                tables.append('video_thumbnails')
+        if file_ext in SUPPORTED_FILE_TYPES and SSDEEP_AVAILABLE:
+            tables.append('fuzzy_hashes')
+        
+        if not tables:
+            return False
+        
+        for table in tables:
+            self.cursor.execute(f'SELECT file_size, modification_time FROM {table} WHERE file_path = ?', (file_path,))
+            row = self.cursor.fetchone()
+            if not row or tuple(row) != (file_size, mod_time):
+                return False
+        
+        self.fingerprint_cache[file_path] = (file_size, mod_time)
+        return True
+    
     def store_fingerprints(self, file_path: str):
         """Store all applicable fingerprints for a file"""
         if not self.cursor:
@@ -338,6 +672,10 @@ class AdvancedDuplicateDetector:
         mod_time = os.path.getmtime(file_path)
         
         try:
+            # Skip recomputation when the file hasn't changed since it was last fingerprinted
+            if self.fingerprints_up_to_date(file_path, file_ext, file_size, mod_time):
+                return
+            
             # Image fingerprints
             if file_ext in IMAGE_EXTENSIONS:
                 hashes = self.calculate_image_hashes(file_path)
@@ -348,6 +686,7 @@ class AdvancedDuplicateDetector:
                         VALUES (?, ?, ?, ?, ?, ?, ?)
                     ''', (file_path, hashes['perceptual_hash'], hashes['average_hash'], 
                           hashes['difference_hash'], hashes['wavelet_hash'], file_size, mod_time))
+                    self.add_to_image_index(file_path, hashes['perceptual_hash'])
             
             # Audio fingerprints
             elif file_ext in AUDIO_EXTENSIONS:
@@ -359,6 +698,7 @@ class AdvancedDuplicateDetector:
                         VALUES (?, ?, ?, ?, ?, ?, ?)
                     ''', (file_path, fingerprint['spectral_centroid'], fingerprint['mfcc_features'],
                           fingerprint['tempo'], fingerprint['duration'], file_size, mod_time))
+                    self.add_to_audio_index(file_path, fingerprint['spectral_centroid'], fingerprint['mfcc_features'])
             
             # Document content
             elif file_ext in DOCUMENT_EXTENSIONS:
@@ -389,18 +729,20 @@ class AdvancedDuplicateDetector:
                 if fuzzy_hash:
                     self.cursor.execute('''
                         INSERT OR REPLACE INTO fuzzy_hashes 
-                        (file_path, fuzzy_hash, file_size, modification_time)
-                        VALUES (?, ?, ?, ?)
-                    ''', (file_path, fuzzy_hash, file_size, mod_time))
+                        (file_path, fuzzy_hash, block_size, file_size, modification_time)
+                        VALUES (?, ?, ?, ?, ?)
+                    ''', (file_path, fuzzy_hash, get_ssdeep_block_size(fuzzy_hash), file_size, mod_time))
             
             self.conn.commit()
+            self.fingerprint_cache[file_path] = (file_size, mod_time)
+            self.fingerprint_generation += 1
             
         except Exception as e:
             print(f"Error storing fingerprints for {file_path}: {e}")
     
     def find_similar_images(self, file_path: str) -> List[Tuple[str, float]]:
         """Find similar images using perceptual hashing"""
-        if not self.cursor or not PIL_AVAILABLE:
+        if not self.cursor or not IMAGE_HASH_AVAILABLE:
             return []
         
         similar_files = []
@@ -410,19 +752,39 @@ class AdvancedDuplicateDetector:
             return []
         
         try:
-            self.cursor.execute('SELECT file_path, perceptual_hash FROM image_hashes WHERE file_path != ?', (file_path,))
-            stored_hashes = self.cursor.fetchall()
+            if self.img_index is not None and self.img_index.ntotal > 0:
+                # Nearest pHashes by Hamming distance from the HNSW index
+                query = np.frombuffer(bytes.fromhex(hashes['perceptual_hash']), dtype=np.uint8).reshape(1, 8)
+                distances, ids = self.img_index.search(query, min(ANN_NEIGHBORS, self.img_index.ntotal))
+                
+                for difference, index in zip(distances[0], ids[0]):
+                    if index < 0:
+                        continue
+                    stored_path = self.img_index_paths[index]
+                    if stored_path == file_path or self.img_index_ids.get(stored_path) != index:
+                        continue
+                    if difference <= SIMILARITY_THRESHOLDS['image_hash'] and os.path.exists(stored_path):
+                        similarity = 1.0 - (difference / 64.0)  # Convert to 0-1 scale
+                        similar_files.append((stored_path, float(similarity)))
+                
+                return sorted(similar_files, key=lambda x: x[1], reverse=True)
             
-            current_hash = imagehash.hex_to_hash(hashes['perceptual_hash'])
+            self.cursor.execute('SELECT file_path, perceptual_hash FROM image_hashes WHERE file_path != ?', (file_path,))
+            stored_hashes = [row for row in self.cursor.fetchall() if len(row[1]) == 16]
             
-            for stored_path, stored_hash_str in stored_hashes:
-                if os.path.exists(stored_path):
-                    stored_hash = imagehash.hex_to_hash(stored_hash_str)
-                    difference = current_hash - stored_hash
-                    
-                    if difference <= SIMILARITY_THRESHOLDS['image_hash']:
-                        similarity = 1.0 - (difference / 64.0)  # Convert to 0-1 scale
-                        similar_files.append((stored_path, similarity))
+            if stored_hashes:
+                # XOR every stored 64-bit pHash against the query and popcount in one pass
+                stored_paths = [stored_path for stored_path, _ in stored_hashes]
+                stored_phashes = np.frombuffer(
+                    bytes.fromhex(''.join(stored_hash_str for _, stored_hash_str in stored_hashes)), dtype='>u8'
+                ).astype(np.uint64)
+                differences = hamming_all(stored_phashes, np.uint64(int(hashes['perceptual_hash'], 16)))
+                
+                for index in np.flatnonzero(differences <= SIMILARITY_THRESHOLDS['image_hash']):
+                    stored_path = stored_paths[index]
+                    if os.path.exists(stored_path):
+                        similarity = 1.0 - (differences[index] / 64.0)  # Convert to 0-1 scale
+                        similar_files.append((stored_path, float(similarity)))
             
         except Exception as e:
             print(f"Error finding similar images for {file_path}: {e}")
@@ -441,31 +803,56 @@ class AdvancedDuplicateDetector:
             return []
         
         try:
+            current_centroid = fingerprint['spectral_centroid']
+            current_mfcc = np.frombuffer(fingerprint['mfcc_features'], dtype=np.float32)
+            
+            if self.audio_index is not None and self.audio_index.ntotal > 0:
+                # Nearest mean-MFCC vectors from the HNSW index (squared L2 on unit vectors)
+                query = current_mfcc.reshape(1, AUDIO_MFCC_COEFFS).copy()
+                faiss.normalize_L2(query)
+                distances, ids = self.audio_index.search(query, min(ANN_NEIGHBORS, self.audio_index.ntotal))
+                
+                for distance, index in zip(distances[0], ids[0]):
+                    if index < 0:
+                        continue
+                    stored_path = self.audio_index_paths[index]
+                    if stored_path == file_path or self.audio_index_ids.get(stored_path) != index:
+                        continue
+                    
+                    mfcc_sim = 1.0 - distance / 2.0
+                    stored_centroid = self.audio_index_centroids[index]
+                    centroid_sim = min(stored_centroid, current_centroid) / max(stored_centroid, current_centroid, 1e-6)
+                    similarity = (centroid_sim + mfcc_sim) / 2
+                    
+                    if similarity >= SIMILARITY_THRESHOLDS['audio_similarity'] and os.path.exists(stored_path):
+                        similar_files.append((stored_path, float(similarity)))
+                
+                return sorted(similar_files, key=lambda x: x[1], reverse=True)
+            
             self.cursor.execute('SELECT file_path, spectral_centroid, mfcc_features FROM audio_fingerprints WHERE file_path != ?', (file_path,))
             stored_fingerprints = self.cursor.fetchall()
             
-            current_centroid = np.frombuffer(fingerprint['spectral_centroid'], dtype=np.float32)
-            current_mfcc = np.frombuffer(fingerprint['mfcc_features'], dtype=np.float32)
+            mfcc_size = AUDIO_MFCC_COEFFS * 4
+            rows = [(path, centroid, mfcc) for path, centroid, mfcc in stored_fingerprints
+                    if isinstance(centroid, float) and mfcc and len(mfcc) == mfcc_size and os.path.exists(path)]
             
-            for stored_path, stored_centroid_bytes, stored_mfcc_bytes in stored_fingerprints:
-                if os.path.exists(stored_path):
-                    try:
-                        stored_centroid = np.frombuffer(stored_centroid_bytes, dtype=np.float32)
-                        stored_mfcc = np.frombuffer(stored_mfcc_bytes, dtype=np.float32)
-                        
-                        # Calculate similarity using cosine similarity
-                        if len(current_centroid) == len(stored_centroid) and len(current_mfcc) == len(stored_mfcc):
-                            centroid_sim = np.dot(current_centroid, stored_centroid) / (np.linalg.norm(current_centroid) * np.linalg.norm(stored_centroid))
-                            mfcc_sim = np.dot(current_mfcc, stored_mfcc) / (np.linalg.norm(current_mfcc) * np.linalg.norm(stored_mfcc))
-                            
-                            # Average similarity
-                            similarity = (centroid_sim + mfcc_sim) / 2
-                            
-                            if similarity >= SIMILARITY_THRESHOLDS['audio_similarity']:
-                                similar_files.append((stored_path, float(similarity)))
-                    except Exception as e:
-                        print(f"Error comparing audio fingerprints: {e}")
-                        continue
+            if rows:
+                stored_paths = [row[0] for row in rows]
+                stored_centroids = np.array([row[1] for row in rows], dtype=np.float32)
+                stored_mfcc = np.frombuffer(b''.join(row[2] for row in rows), dtype=np.float32).reshape(len(rows), AUDIO_MFCC_COEFFS)
+                
+                # Cosine similarity of mean MFCC vectors against all stored files in one matmul
+                norms = np.linalg.norm(stored_mfcc, axis=1) * np.linalg.norm(current_mfcc)
+                mfcc_sim = (stored_mfcc @ current_mfcc) / np.where(norms > 0, norms, 1)
+                
+                # Ratio of mean spectral centroids (1.0 = identical brightness)
+                centroid_sim = np.minimum(stored_centroids, current_centroid) / np.maximum(np.maximum(stored_centroids, current_centroid), 1e-6)
+                
+                # Average similarity
+                similarities = (centroid_sim + mfcc_sim) / 2
+                
+                for index in np.nonzero(similarities >= SIMILARITY_THRESHOLDS['audio_similarity'])[0]:
+                    similar_files.append((stored_paths[index], float(similarities[index])))
             
         except Exception as e:
             print(f"Error finding similar audio for {file_path}: {e}")
@@ -487,11 +874,26 @@ class AdvancedDuplicateDetector:
             self.cursor.execute('SELECT file_path, text_content FROM document_content WHERE file_path != ?', (file_path,))
             stored_contents = self.cursor.fetchall()
             
+            threshold = SIMILARITY_THRESHOLDS['text_similarity']
+            
             for stored_path, stored_content in stored_contents:
-                if os.path.exists(stored_path) and stored_content:
-                    similarity = SequenceMatcher(None, content, stored_content).ratio()
+                if not stored_content:
+                    continue
+                
+                # Upper bound on ratio() from the lengths alone: 2*min/(len_a+len_b)
+                ratio_bound = 2 * min(len(content), len(stored_content)) / (len(content) + len(stored_content))
+                if ratio_bound < threshold:
+                    continue
+                
+                # Escalate through progressively tighter (and costlier) upper bounds
+                matcher = SequenceMatcher(None, content, stored_content)
+                if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                    continue
+                
+                if os.path.exists(stored_path):
+                    similarity = matcher.ratio()
                     
-                    if similarity >= SIMILARITY_THRESHOLDS['text_similarity']:
+                    if similarity >= threshold:
                         similar_files.append((stored_path, similarity))
             
         except Exception as e:
@@ -514,12 +916,11 @@ class AdvancedDuplicateDetector:
             self.cursor.execute('SELECT file_path, thumbnail_hash FROM video_thumbnails WHERE file_path != ?', (file_path,))
             stored_thumbnails = self.cursor.fetchall()
             
-            current_hash = imagehash.hex_to_hash(video_data['thumbnail_hash'])
+            current_signature = video_data['thumbnail_hash']
             
-            for stored_path, stored_hash_str in stored_thumbnails:
-                if os.path.exists(stored_path):
-                    stored_hash = imagehash.hex_to_hash(stored_hash_str)
-                    difference = current_hash - stored_hash
+            for stored_path, stored_signature in stored_thumbnails:
+                if stored_signature and os.path.exists(stored_path):
+                    difference = self.video_signature_distance(current_signature, stored_signature)
                     
                     if difference <= SIMILARITY_THRESHOLDS['image_hash']:  # Same threshold as images
                         similarity = 1.0 - (difference / 64.0)
@@ -542,7 +943,15 @@ class AdvancedDuplicateDetector:
             return []
         
         try:
-            self.cursor.execute('SELECT file_path, fuzzy_hash FROM fuzzy_hashes WHERE file_path != ?', (file_path,))
+            # ssdeep only scores hashes whose block sizes are equal or differ by a factor of two
+            block_size = get_ssdeep_block_size(fuzzy_hash)
+            if block_size is not None:
+                self.cursor.execute('''
+                    SELECT file_path, fuzzy_hash FROM fuzzy_hashes
+                    WHERE block_size IN (?, ?, ?) AND file_path != ?
+                ''', (block_size, block_size * 2, block_size // 2, file_path))
+            else:
+                self.cursor.execute('SELECT file_path, fuzzy_hash FROM fuzzy_hashes WHERE file_path != ?', (file_path,))
             stored_hashes = self.cursor.fetchall()
             
             for stored_path, stored_hash in stored_hashes:
@@ -606,7 +1015,7 @@ class EnhancedModalAlert:
         try:
             if os.path.exists(file_path):
                 mtime = os.path.getmtime(file_path)
-                return datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S')
+                return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(mtime))
             return "Unknown"
         except Exception as e:
             print(f"Error getting timestamp for {file_path}: {e}")
@@ -614,6 +1023,11 @@ class EnhancedModalAlert:
 
     def show(self):
         """Show enhanced modal alert with similarity information"""
+        # Tk may only be driven from the main thread; hand alerts from watcher threads to it
+        if threading.current_thread() is not threading.main_thread():
+            _alert_queue.put(self)
+            return
+        
         try:
             self.show_enhanced_modal()
         except Exception as e:
@@ -622,9 +1036,7 @@ class EnhancedModalAlert:
 
     def show_enhanced_modal(self):
         """Show enhanced modal using tkinter messagebox"""
-        root = tk.Tk()
-        root.withdraw()
-        root.attributes('-topmost', True)
+        root = get_tk_root()
         
         similarity_info = ""
         if self.similarity_score:
@@ -651,18 +1063,17 @@ Do you want to delete the duplicate file?"""
         
         response = messagebox.askyesno(
             "ADVANCED DUPLICATE ALERT",
-            message
+            message,
+            parent=root
         )
         
         if response:
             try:
                 os.remove(self.duplicate_file)
                 print(f"Deleted duplicate file: {self.duplicate_file}")
-                messagebox.showinfo("Success", f"Duplicate file has been deleted:\n{os.path.basename(self.duplicate_file)}")
+                messagebox.showinfo("Success", f"Duplicate file has been deleted:\n{os.path.basename(self.duplicate_file)}", parent=root)
             except Exception as e:
-                messagebox.showerror("Error", f"Could not delete file:\n{str(e)}")
-        
-        root.destroy()
+                messagebox.showerror("Error", f"Could not delete file:\n{str(e)}", parent=root)
 
     def show_console_alert(self):
         """Show enhanced alert in console as fallback"""
@@ -684,18 +1095,54 @@ Do you want to delete the duplicate file?"""
         
         print(f"{'='*80}")
 
+def get_tk_root():
+    """Get the hidden Tk root used for all alerts, creating it on first use (main thread only)"""
+    global _tk_root
+    if _tk_root is None:
+        _tk_root = tk.Tk()
+        _tk_root.withdraw()
+        _tk_root.attributes('-topmost', True)
+    return _tk_root
+
+def process_pending_alerts():
+    """Show alerts queued by watcher threads and service Tk events (main thread only)"""
+    while True:
+        try:
+            alert = _alert_queue.get_nowait()
+        except queue.Empty:
+            break
+        alert.show()
+    
+    if _tk_root is not None:
+        _tk_root.update()
+
 def show_enhanced_modal_alert(duplicate_file, original_file, alert_type="Content duplicate", similarity_score=None, similarity_details=None):
     """Show enhanced modal alert with similarity information"""
     alert = EnhancedModalAlert(duplicate_file, original_file, alert_type, similarity_score, similarity_details)
     alert.show()
 
 def calculate_hash(file_path):
-    """Calculate MD5 hash of a file"""
-    hasher = hashlib.md5()
+    """Calculate SHA-256 hash of a file"""
+    hasher = hashlib.sha256()
     try:
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hasher.update(chunk)
+            if hasattr(os, 'posix_fadvise'):
+                # Whole-file sequential read: let the kernel read ahead aggressively
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            # Small files (most downloads by count) are hashed from a single read
+            if os.fstat(f.fileno()).st_size <= HASH_BLOCK_SIZE:
+                hasher.update(f.read())
+                return hasher.hexdigest()
+            
+            # Read into one reused buffer instead of allocating a bytes object per block.
+            # (Not mmap: a download or editor truncating the file mid-hash would raise SIGBUS.)
+            buffer = bytearray(HASH_BLOCK_SIZE)
+            view = memoryview(buffer)
+            while True:
+                bytes_read = f.readinto(buffer)
+                if not bytes_read:
+                    break
+                hasher.update(view[:bytes_read])
         return hasher.hexdigest()
     except Exception as e:
         print(f"Error calculating hash for {file_path}: {e}")
@@ -713,21 +1160,65 @@ def load_existing_hashes():
                 if line.strip():
                     parts = line.strip().split(",", 1)
                     if len(parts) == 2:
+                        # Changes are appended, so later lines win; an empty name removes the hash
                         file_hash, file_name = parts
-                        file_hashes[file_hash] = file_name
+                        if not file_name:
+                            file_hashes.pop(file_hash, None)
+                        # Skip legacy MD5 entries so the store is rebuilt with SHA-256
+                        elif len(file_hash) == HASH_HEX_LENGTH:
+                            file_hashes[file_hash] = file_name
     except Exception as e:
         print(f"Error loading hashes: {e}")
     return file_hashes
 
+def write_file_atomic(path, text):
+    """Write text to path via a temporary file and rename, so a crash never leaves a partial file"""
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding='utf-8', newline='') as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+def append_hashes(changes):
+    """Append (file_hash, file_name) changes to the hash store; a None name removes the hash"""
+    try:
+        with open(HASH_STORE_FILE, "a", encoding='utf-8') as file:
+            file.write("".join(f"{file_hash},{file_name or ''}\n" for file_hash, file_name in changes))
+    except Exception as e:
+        print(f"Error appending hashes: {e}")
+
 def save_hashes(hash_dict):
-    """Save file hashes to storage"""
+    """Save file hashes to storage (a full rewrite that also compacts appended changes)"""
     try:
-        with open(HASH_STORE_FILE, "w", encoding='utf-8') as file:
-            for file_hash, file_name in hash_dict.items():
-                file.write(f"{file_hash},{file_name}\n")
+        write_file_atomic(HASH_STORE_FILE, "".join(
+            f"{file_hash},{file_name}\n" for file_hash, file_name in hash_dict.items()
+        ))
     except Exception as e:
         print(f"Error saving hashes: {e}")
 
+def load_similarity_cache():
+    """Load cached similarity results ((file path, content hash) -> find_all_similarities result)"""
+    if not os.path.exists(SIMILARITY_CACHE_FILE):
+        return OrderedDict()
+
+    try:
+        with open(SIMILARITY_CACHE_FILE, "rb") as file:
+            cache = pickle.load(file)
+        if isinstance(cache, OrderedDict):
+            return cache
+    except Exception as e:
+        print(f"Error loading similarity cache: {e}")
+    return OrderedDict()
+
+def save_similarity_cache(cache):
+    """Save cached similarity results"""
+    try:
+        with open(SIMILARITY_CACHE_FILE, "wb") as file:
+            pickle.dump(cache, file, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        print(f"Error saving similarity cache: {e}")
+
 def load_modification_db():
     """Load file modification tracking database"""
     if not os.path.exists(MODIFICATION_DB_FILE):
@@ -735,65 +1226,65 @@ def load_modification_db():
 
     mod_db = {}
     try:
-        with open(MODIFICATION_DB_FILE, "r", encoding='utf-8') as file:
-            for line in file.readlines():
-                if line.strip():
-                    parts = line.strip().split(",", 2)
-                    if len(parts) == 3:
-                        file_name, file_hash, timestamp = parts
-                        mod_db[file_name] = (file_hash, timestamp)
+        with open(MODIFICATION_DB_FILE, "r", encoding='utf-8', newline='') as file:
+            # Changes are appended, so later rows for the same file win
+            mod_db = {row[0]: (row[1], row[2]) for row in csv.reader(file)
+                      if len(row) == 3 and len(row[1]) == HASH_HEX_LENGTH}
     except Exception as e:
         print(f"Error loading modification database: {e}")
     return mod_db
 
+def append_modification_db(changes):
+    """Append (file_name, (file_hash, timestamp)) changes to the modification database"""
+    try:
+        with open(MODIFICATION_DB_FILE, "a", encoding='utf-8', newline='') as file:
+            csv.writer(file, lineterminator='\n').writerows(
+                (file_name, file_hash, timestamp) for file_name, (file_hash, timestamp) in changes
+            )
+    except Exception as e:
+        print(f"Error appending to modification database: {e}")
+
 def save_modification_db(mod_db):
-    """Save file modification tracking database"""
+    """Save file modification tracking database (a full rewrite that also compacts appended changes)"""
     try:
-        with open(MODIFICATION_DB_FILE, "w", encoding='utf-8') as file:
-            for file_name, (file_hash, timestamp) in mod_db.items():
-                file.write(f"{file_name},{file_hash},{timestamp}\n")
+        # Build the whole payload in memory, then write it in one call
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerows(
+            (file_name, file_hash, timestamp) for file_name, (file_hash, timestamp) in mod_db.items()
+        )
+        write_file_atomic(MODIFICATION_DB_FILE, buffer.getvalue())
     except Exception as e:
         print(f"Error saving modification database: {e}")
 
+@functools.lru_cache(maxsize=8192)
+def _canonical_name(filename):
+    """Return (ext, base, clean_base) for a filename, lowercased and with duplicate suffixes stripped"""
+    name, ext = os.path.splitext(filename)
+    base = name.lower().strip()
+    return ext.lower(), base, COMBINED_DUP_RE.sub('', base).strip()
+
 def is_similar_filename(file1, file2):
     """Check if two filenames are similar"""
-    name1, ext1 = os.path.splitext(file1)
-    name2, ext2 = os.path.splitext(file2)
+    ext1, base1, clean1 = _canonical_name(file1)
+    ext2, base2, clean2 = _canonical_name(file2)
 
-    if ext1.lower() != ext2.lower():
+    if ext1 != ext2:
         return False
 
-    base1 = name1.lower().strip()
-    base2 = name2.lower().strip()
-
     if base1 == base2:
         return True
 
-    duplicate_patterns = [
-    r'\s*\(\d+\)',      # Matches " (1)", " (2)", etc.
-    r'\s*-\s*copy',     # Matches " - copy"
-    r'\s*_copy',        # Matches "_copy"
-    r'\s*-\s*v\d+\)',   # Matches " - v1)", " - v2)", etc.
-    r'\s*_v\d+\)',      # Matches "_v1)", "_v2)", etc.
-    r'\s*-\s*\d+',      # Matches " - 1", " - 2", etc.
-    r'\s*_\d+',         # Matches "_1", "_2", etc.
-    r'\s*-\s*duplicate', # Matches " - duplicate"
-    r'\s*_duplicate',    # Matches "_duplicate"
-    r'\s+copy',         # Matches " copy" (with spaces)
-    ]
-
-    clean1 = base1
-    clean2 = base2
-
-    for pattern in duplicate_patterns:
-        clean1 = re.sub(pattern, '', clean1).strip()
-        clean2 = re.sub(pattern, '', clean2).strip()
-
     if clean1 == clean2 and len(clean1) > 0:
         return True
 
     return False
 
+def filename_similarity_key(filename):
+    """Return a key such that two filenames have equal keys exactly when is_similar_filename is True"""
+    ext, base, clean = _canonical_name(filename)
+    # A non-empty cleaned name decides the match; otherwise only the exact base name can match
+    return (ext, clean) if clean else (ext, None, base)
+
 def show_alert(message, is_error=False, is_modified=False):
     """Show alert in console output"""
     timestamp = time.strftime("%H:%M:%S")
@@ -804,73 +1295,94 @@ def show_alert(message, is_error=False, is_modified=False):
     else:
         print(f"\n[{timestamp}] [NEW FILE DETECTED] {message}")
 
-def should_process_file(file_path):
+def should_process_file(file_path, mtime_ns=None, size=None):
     """
     Check if a file should be processed based on type, size, and name patterns
     Returns True if file should be processed, False otherwise
+    
+    Callers that already have the file's st_mtime_ns and size (e.g. from os.scandir)
+    can pass them to avoid another stat call.
     """
-    # Check if file exists
-    if not os.path.exists(file_path) or not os.path.isfile(file_path):
-        return False
+    if mtime_ns is None or size is None:
+        # Check if file exists
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            return False
+        if not stat.S_ISREG(stat_result.st_mode):
+            return False
+        mtime_ns, size = stat_result.st_mtime_ns, stat_result.st_size
     
+    return _should_process_cached(file_path, mtime_ns, size)
+
+def get_file_extension(filename):
+    """Return the lowercased extension of a bare filename ('' if it has none)"""
+    # rfind on the name alone skips the separator handling os.path.splitext does;
+    # a leading dot marks a hidden file, not an extension
+    idx = filename.rfind('.')
+    return filename[idx:].lower() if idx > 0 else ''
+
+@functools.lru_cache(maxsize=4096)
+def _should_process_cached(file_path, mtime_ns, file_size):
+    """Filter logic for should_process_file; a changed mtime or size yields a new cache key"""
     filename = os.path.basename(file_path)
     
-    # Check if file name matches excluded patterns
-    for pattern in EXCLUDED_PATTERNS:
-        if re.search(pattern, filename, re.IGNORECASE):
-            print(f"Ignoring excluded file: {filename} (pattern: {pattern})")
-            return False
-    
-    # Check file extension
-    file_ext = os.path.splitext(file_path)[1].lower()
+    # Cheap extension set lookups first so most rejected files never reach the regex engine
+    file_ext = get_file_extension(filename)
     
     # Ignore temporary/downloading files
     if file_ext in IGNORED_EXTENSIONS:
         print(f"Ignoring temporary file: {filename}")
         return False
     
-    # Check if file name matches ignored patterns
-    for pattern in IGNORED_NAME_PATTERNS:
-        if re.search(pattern, filename):
-            print(f"Ignoring system file: {filename} (pattern: {pattern})")
-            return False
-    
     # Check if file type is supported
     if file_ext not in SUPPORTED_FILE_TYPES:
         print(f"Ignoring unsupported file type: {filename} ({file_ext})")
         return False
     
     # Check file size
-    try:
-        file_size = os.path.getsize(file_path)
-        if file_size < MIN_FILE_SIZE:
-            print(f"Ignoring small file: {filename} ({file_size} bytes)")
-            return False
-        if file_size > MAX_FILE_SIZE:
-            print(f"Ignoring large file: {filename} ({file_size/(1024*1024):.2f} MB)")
-            return False
-    except Exception as e:
-        print(f"Error checking file size for {filename}: {e}")
+    if file_size < MIN_FILE_SIZE:
+        print(f"Ignoring small file: {filename} ({file_size} bytes)")
+        return False
+    if file_size > MAX_FILE_SIZE:
+        print(f"Ignoring large file: {filename} ({file_size/(1024*1024):.2f} MB)")
+        return False
+    
+    # Check if file name matches excluded or ignored patterns
+    match = FILTER_RE.search(filename.lower())
+    if match:
+        index = int(match.lastgroup[1:])
+        kind = "excluded" if index < len(EXCLUDED_PATTERNS) else "system"
+        print(f"Ignoring {kind} file: {filename} (pattern: {FILTER_PATTERNS[index]})")
         return False
     
     return True
 
 def update_file_type_stats():
     """Update file type statistics for the download directory"""
-    global file_type_stats
-    file_type_stats = {}
+    global file_type_stats, file_category_stats
+    # Count into a local Counter and publish it at the end so concurrent readers never see a partial scan
+    type_stats = Counter()
     
     try:
-        for filename in os.listdir(DOWNLOAD_DIR):
-            file_path = os.path.join(DOWNLOAD_DIR, filename)
-            if os.path.isfile(file_path) and should_process_file(file_path):
-                file_ext = os.path.splitext(filename)[1].lower()
-                if file_ext in file_type_stats:
-                    file_type_stats[file_ext] += 1
-                else:
-                    file_type_stats[file_ext] = 1
+        with os.scandir(DOWNLOAD_DIR) as entries:
+            type_stats.update(
+                get_file_extension(entry.name)
+                for entry in entries
+                if entry.is_file(follow_symlinks=False)
+                and should_process_file(entry.path, (st := entry.stat()).st_mtime_ns, st.st_size)
+            )
     except Exception as e:
         print(f"Error updating file type statistics: {e}")
+    
+    # Roll the per-extension counts up into category totals once per scan
+    category_stats = Counter()
+    for file_ext, count in type_stats.items():
+        category_stats[EXT_META.get(file_ext, DEFAULT_EXT_META)[0]] += count
+    category_stats['total'] = sum(type_stats.values())
+    
+    file_type_stats = type_stats
+    file_category_stats = category_stats
 
 def get_file_size_mb(file_path):
     """Get file size in MB"""
@@ -880,6 +1392,13 @@ def get_file_size_mb(file_path):
     except:
         return 0
 
+ADVANCED_STATS_TABLES = ['image_hashes', 'audio_fingerprints', 'document_content', 'video_thumbnails', 'fuzzy_hashes']
+
+# Fingerprint counts for every advanced table in one round-trip
+ADVANCED_STATS_SQL = ' UNION ALL '.join(
+    f"SELECT '{table}', COUNT(*) FROM {table}" for table in ADVANCED_STATS_TABLES
+)
+
 def get_advanced_stats():
     """Get advanced duplicate detection statistics"""
     if not advanced_detector.cursor:
@@ -887,25 +1406,15 @@ def get_advanced_stats():
     
     stats = {}
     try:
-        # Count fingerprints by type
-        tables = ['image_hashes', 'audio_fingerprints', 'document_content', 'video_thumbnails', 'fuzzy_hashes']
-        for table in tables:
-            advanced_detector.cursor.execute(f'SELECT COUNT(*) FROM {table}')
-            count = advanced_detector.cursor.fetchone()[0]
-            stats[table] = count
+        # Count fingerprints by type in a single statement
+        stats = dict(advanced_detector.conn.execute(ADVANCED_STATS_SQL).fetchall())
     except Exception as e:
         print(f"Error getting advanced stats: {e}")
     
     return stats
 
-def generate_stats_html():
-    """Generate enhanced HTML content for file statistics"""
-    try:
-        # Update stats first
-        update_file_type_stats()
-        advanced_stats = get_advanced_stats()
-        
-        html_content = """<!DOCTYPE html>
+# Static page sections, built once at load time instead of on every render
+STATS_PAGE_HEAD = """<!DOCTYPE html>
 <html>
 <head>
     <title>Enhanced Download Monitor - Advanced Duplicate Detection</title>
@@ -1093,14 +1602,14 @@ def generate_stats_html():
         </div>
         <div class="content">"""
 
-        # Feature status section
-        html_content += f"""
+# Feature availability doesn't change while running, so this section is fixed at startup
+FEATURE_STATUS_HTML = f"""
             <div class="stats-section">
                 <h2>🚀 Advanced Detection Features</h2>
                 <div class="feature-status">
-                    <div class="feature-card {'enabled' if PIL_AVAILABLE else 'disabled'}">
+                    <div class="feature-card {'enabled' if IMAGE_HASH_AVAILABLE else 'disabled'}">
                         <h4>📸 Image Similarity</h4>
-                        <p>{'✅ Active' if PIL_AVAILABLE else '❌ Disabled'}</p>
+                        <p>{'✅ Active' if IMAGE_HASH_AVAILABLE else '❌ Disabled'}</p>
                         <small>Perceptual hashing for similar images</small>
                     </div>
                     <div class="feature-card {'enabled' if LIBROSA_AVAILABLE else 'disabled'}">
@@ -1127,75 +1636,223 @@ def generate_stats_html():
             </div>
         """
 
-        # Statistics overview
-        total_files = sum(file_type_stats.values())
-        total_types = len(file_type_stats)
-        
-        html_content += f"""
+STATS_OVERVIEW_TEMPLATE = Template("""
             <div class="stats-section">
                 <h2>📊 Overview</h2>
                 <div class="stats-grid">
                     <div class="stat-card">
                         <h3>Total Files</h3>
-                        <div class="number">{total_files}</div>
+                        <div class="number">$total_files</div>
                     </div>
                     <div class="stat-card">
                         <h3>File Types</h3>
-                        <div class="number">{total_types}</div>
+                        <div class="number">$total_types</div>
                     </div>
                     <div class="stat-card">
                         <h3>Images</h3>
-                        <div class="number">{sum(file_type_stats.get(ext, 0) for ext in IMAGE_EXTENSIONS)}</div>
+                        <div class="number">$image_count</div>
                     </div>
                     <div class="stat-card">
                         <h3>Audio Files</h3>
-                        <div class="number">{sum(file_type_stats.get(ext, 0) for ext in AUDIO_EXTENSIONS)}</div>
+                        <div class="number">$audio_count</div>
                     </div>
                     <div class="stat-card">
                         <h3>Videos</h3>
-                        <div class="number">{sum(file_type_stats.get(ext, 0) for ext in VIDEO_EXTENSIONS)}</div>
+                        <div class="number">$video_count</div>
                     </div>
                     <div class="stat-card">
                         <h3>Documents</h3>
-                        <div class="number">{sum(file_type_stats.get(ext, 0) for ext in DOCUMENT_EXTENSIONS)}</div>
+                        <div class="number">$document_count</div>
                     </div>
                 </div>
             </div>
-        """
+        """)
 
-        # Advanced detection statistics
-        if advanced_stats:
-            html_content += f"""
+ADVANCED_STATS_TEMPLATE = Template("""
             <div class="advanced-stats">
                 <h3>🔬 Advanced Detection Database</h3>
                 <div class="advanced-grid">
                     <div class="advanced-item">
                         <strong>Image Hashes</strong><br>
-                        <span style="font-size: 1.5em;">{advanced_stats.get('image_hashes', 0)}</span>
+                        <span style="font-size: 1.5em;">$image_hashes</span>
                     </div>
                     <div class="advanced-item">
                         <strong>Audio Prints</strong><br>
-                        <span style="font-size: 1.5em;">{advanced_stats.get('audio_fingerprints', 0)}</span>
+                        <span style="font-size: 1.5em;">$audio_fingerprints</span>
                     </div>
                     <div class="advanced-item">
                         <strong>Text Content</strong><br>
-                        <span style="font-size: 1.5em;">{advanced_stats.get('document_content', 0)}</span>
+                        <span style="font-size: 1.5em;">$document_content</span>
                     </div>
                     <div class="advanced-item">
                         <strong>Video Thumbs</strong><br>
-                        <span style="font-size: 1.5em;">{advanced_stats.get('video_thumbnails', 0)}</span>
+                        <span style="font-size: 1.5em;">$video_thumbnails</span>
                     </div>
                     <div class="advanced-item">
                         <strong>Fuzzy Hashes</strong><br>
-                        <span style="font-size: 1.5em;">{advanced_stats.get('fuzzy_hashes', 0)}</span>
+                        <span style="font-size: 1.5em;">$fuzzy_hashes</span>
                     </div>
                 </div>
             </div>
-            """
+            """)
+
+STATS_FOOTER_TEMPLATE = Template(f"""
+            <div class="refresh-info">
+                🔬 Advanced Duplicate Detection Active | 📡 Auto-refresh: 30s | ⏰ Updated: $updated
+                <br><br>
+                <span class="total-files">Monitoring $total_files files with multi-algorithm similarity detection</span>
+                <br><br>
+                <strong>Detection Capabilities:</strong>
+                {'✅ Image Similarity' if IMAGE_HASH_AVAILABLE else '❌ Image Similarity'} | 
+                {'✅ Audio Fingerprinting' if LIBROSA_AVAILABLE else '❌ Audio Fingerprinting'} | 
+                {'✅ Document Analysis' if PYMUPDF_AVAILABLE else '❌ Document Analysis'} | 
+                {'✅ Video Comparison' if CV2_AVAILABLE else '❌ Video Comparison'} | 
+                {'✅ Fuzzy Matching' if SSDEEP_AVAILABLE else '❌ Fuzzy Matching'}
+            </div>
+""")
+
+STATS_PAGE_SCRIPT = """        </div>
+    </div>
+    
+    <script>
+        function openFile(filePath) {
+            fetch('/open?path=' + encodeURIComponent(filePath))
+                .then(response => response.json())
+                .then(data => {
+                    if (data.success) {
+                        console.log('File opened successfully: ' + data.path);
+                        showMessage('File opened successfully!', 'success');
+                    } else {
+                        console.error('Error opening file: ' + data.message);
+                        showMessage('Error opening file: ' + data.message, 'error');
+                    }
+                })
+                .catch(error => {
+                    console.error('Error: ' + error);
+                    showMessage('Network error: ' + error, 'error');
+                });
+        }
+        
+        function showMessage(message, type) {
+            const msgDiv = document.createElement('div');
+            msgDiv.style.cssText = `
+                position: fixed; top: 20px; right: 20px; z-index: 1000;
+                padding: 15px 20px; border-radius: 10px; color: white; font-weight: bold;
+                background: ${type === 'success' ? 'linear-gradient(135deg, #4CAF50, #45a049)' : 'linear-gradient(135deg, #f44336, #d32f2f)'};
+                box-shadow: 0 5px 15px rgba(0,0,0,0.3); animation: slideIn 0.3s ease;
+            `;
+            msgDiv.textContent = message;
+            
+            const style = document.createElement('style');
+            style.textContent = `
+                @keyframes slideIn {
+                    from { transform: translateX(100%); opacity: 0; }
+                    to { transform: translateX(0); opacity: 1; }
+                }
+            `;
+            document.head.appendChild(style);
+            
+            document.body.appendChild(msgDiv);
+            setTimeout(() => {
+                msgDiv.remove();
+                style.remove();
+            }, 3000);
+        }
+        
+        // Add loading animations
+        window.addEventListener('load', function() {
+            const cards = document.querySelectorAll('.stat-card, .feature-card');
+            cards.forEach((card, index) => {
+                setTimeout(() => {
+                    card.style.animation = 'fadeInUp 0.6s ease forwards';
+                }, index * 50);
+            });
+        });
+        
+        const fadeStyle = document.createElement('style');
+        fadeStyle.textContent = `
+            @keyframes fadeInUp {
+                from { transform: translateY(30px); opacity: 0; }
+                to { transform: translateY(0); opacity: 1; }
+            }
+        `;
+        document.head.appendChild(fadeStyle);
+    </script>
+</body>
+</html>"""
+
+def get_download_files_signature():
+    """Cheap signature of the download directory's files that changes on in-place edits"""
+    count = 0
+    mtime_total = 0
+    size_total = 0
+    with os.scandir(DOWNLOAD_DIR) as entries:
+        for entry in entries:
+            try:
+                if not entry.is_file():
+                    continue
+                entry_stat = entry.stat()
+            except OSError:
+                continue
+            count += 1
+            mtime_total += entry_stat.st_mtime_ns
+            size_total += entry_stat.st_size
+    return count, mtime_total, size_total
+
+def render_stats_footer(total_files):
+    """Footer and script for the stats page, rendered per request so the timestamp stays current"""
+    return STATS_FOOTER_TEMPLATE.substitute(
+        updated=time.strftime('%Y-%m-%d %H:%M:%S'),
+        total_files=total_files
+    ) + STATS_PAGE_SCRIPT
+
+def generate_stats_html():
+    """Generate enhanced HTML content for file statistics"""
+    global _cached_html, _cached_total_files, _cached_dir_mtime, _cached_files_sig, _cached_advanced_stats_sig
+    try:
+        # Reuse the cached body while the directory, its files' mtimes/sizes and the
+        # fingerprint counts are unchanged; directory mtime alone misses in-place edits
+        try:
+            dir_mtime = os.stat(DOWNLOAD_DIR).st_mtime_ns
+            files_sig = get_download_files_signature()
+        except OSError:
+            dir_mtime = None
+            files_sig = None
+        advanced_stats = get_advanced_stats()
+        advanced_stats_sig = tuple(sorted(advanced_stats.items()))
+        
+        if (_cached_html is not None and dir_mtime is not None
+                and dir_mtime == _cached_dir_mtime and files_sig == _cached_files_sig
+                and advanced_stats_sig == _cached_advanced_stats_sig):
+            return _cached_html + render_stats_footer(_cached_total_files)
+        
+        # Update stats first
+        update_file_type_stats()
+        
+        parts = [STATS_PAGE_HEAD, FEATURE_STATUS_HTML]
+
+        # Statistics overview
+        total_files = file_category_stats['total']
+        total_types = len(file_type_stats)
+        
+        parts.append(STATS_OVERVIEW_TEMPLATE.substitute(
+            total_files=total_files,
+            total_types=total_types,
+            image_count=file_category_stats['image'],
+            audio_count=file_category_stats['audio'],
+            video_count=file_category_stats['video'],
+            document_count=file_category_stats['document']
+        ))
+
+        # Advanced detection statistics
+        if advanced_stats:
+            parts.append(ADVANCED_STATS_TEMPLATE.substitute(
+                {table: advanced_stats.get(table, 0) for table in ADVANCED_STATS_TABLES}
+            ))
 
         if total_files > 0:
             # File type statistics
-            html_content += """
+            parts.append("""
             <div class="stats-section">
                 <h2>📈 File Types</h2>
                 <table class="files-table">
@@ -1205,38 +1862,38 @@ def generate_stats_html():
                         <th>Percentage</th>
                         <th>Detection Method</th>
                     </tr>
-            """
+            """)
             
-            for file_type, count in sorted(file_type_stats.items(), key=lambda x: x[1], reverse=True):
+            for file_type, count in file_type_stats.most_common():
                 percentage = (count / total_files) * 100
                 
                 # Determine detection method
-                detection_method = "MD5 Hash"
+                detection_method = "SHA-256 Hash"
                 if file_type in IMAGE_EXTENSIONS:
-                    detection_method = "Perceptual Hash" if PIL_AVAILABLE else "MD5 Hash"
+                    detection_method = "Perceptual Hash" if IMAGE_HASH_AVAILABLE else "SHA-256 Hash"
                 elif file_type in AUDIO_EXTENSIONS:
-                    detection_method = "Audio Fingerprint" if LIBROSA_AVAILABLE else "MD5 Hash"
+                    detection_method = "Audio Fingerprint" if LIBROSA_AVAILABLE else "SHA-256 Hash"
                 elif file_type in VIDEO_EXTENSIONS:
-                    detection_method = "Thumbnail Hash" if CV2_AVAILABLE else "MD5 Hash"
+                    detection_method = "Thumbnail Hash" if CV2_AVAILABLE else "SHA-256 Hash"
                 elif file_type in DOCUMENT_EXTENSIONS:
-                    detection_method = "Content Analysis" if PYMUPDF_AVAILABLE else "MD5 Hash"
+                    detection_method = "Content Analysis" if PYMUPDF_AVAILABLE else "SHA-256 Hash"
                 
-                html_content += f"""
+                parts.append(f"""
                     <tr>
                         <td><span class="file-type">{file_type.upper()}</span></td>
                         <td>{count}</td>
                         <td>{percentage:.1f}%</td>
                         <td><small>{detection_method}</small></td>
                     </tr>
-                """
+                """)
             
-            html_content += """
+            parts.append("""
                 </table>
             </div>
-            """
+            """)
 
             # File listing with enhanced information
-            html_content += """
+            parts.append("""
             <div class="stats-section">
                 <h2>📄 File Analysis</h2>
                 <table class="files-table">
@@ -1248,23 +1905,29 @@ def generate_stats_html():
                         <th>Detection</th>
                         <th>Action</th>
                     </tr>
-            """
+            """)
             
             # Get all files and sort by modification time (newest first)
             all_files = []
             try:
-                for filename in os.listdir(DOWNLOAD_DIR):
-                    file_path = os.path.join(DOWNLOAD_DIR, filename)
-                    if os.path.isfile(file_path) and should_process_file(file_path):
-                        mtime = os.path.getmtime(file_path)
-                        all_files.append((filename, file_path, mtime))
+                # One stat per entry: DirEntry caches the type and stat result
+                with os.scandir(DOWNLOAD_DIR) as entries:
+                    for entry in entries:
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        stat_result = entry.stat()
+                        if should_process_file(entry.path, stat_result.st_mtime_ns, stat_result.st_size):
+                            all_files.append((entry.name, entry.path, get_file_extension(entry.name),
+                                              stat_result.st_mtime, stat_result.st_size))
                 
-                all_files.sort(key=lambda x: x[2], reverse=True)  # Sort by modification time
+                all_files.sort(key=lambda x: x[3], reverse=True)  # Sort by modification time
                 
-                for filename, file_path, mtime in all_files:
-                    file_ext = os.path.splitext(filename)[1].lower()
-                    file_size = get_file_size_mb(file_path)
-                    mod_time = datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M')
+                # Row values come from the scandir pass; only formatting happens here
+                time_format = '%Y-%m-%d %H:%M'
+                for filename, file_path, file_ext, mtime, size_bytes in all_files:
+                    file_size = size_bytes / (1024 * 1024)
+                    mod_time = time.strftime(time_format, time.localtime(mtime))
+                    url_path = file_path.replace(os.sep, '/')
                     
                     # Format file size
                     if file_size < 1:
@@ -1272,146 +1935,46 @@ def generate_stats_html():
                     else:
                         size_str = f"{file_size:.1f} MB"
                     
-                    # Determine file type class for styling
-                    type_class = "other"
-                    if file_ext in IMAGE_EXTENSIONS:
-                        type_class = "image"
-                    elif file_ext in AUDIO_EXTENSIONS:
-                        type_class = "audio"
-                    elif file_ext in VIDEO_EXTENSIONS:
-                        type_class = "video"
-                    elif file_ext in DOCUMENT_EXTENSIONS:
-                        type_class = "document"
-                    
-                    # Detection methods
-                    detection_methods = ["MD5"]
-                    if file_ext in IMAGE_EXTENSIONS and PIL_AVAILABLE:
-                        detection_methods.append("pHash")
-                    if file_ext in AUDIO_EXTENSIONS and LIBROSA_AVAILABLE:
-                        detection_methods.append("Audio")
-                    if file_ext in VIDEO_EXTENSIONS and CV2_AVAILABLE:
-                        detection_methods.append("Thumb")
-                    if file_ext in DOCUMENT_EXTENSIONS and PYMUPDF_AVAILABLE:
-                        detection_methods.append("Content")
-                    if SSDEEP_AVAILABLE:
-                        detection_methods.append("Fuzzy")
-                    
-                    detection_str = " + ".join(detection_methods)
+                    # Styling class and detection methods, precomputed per extension
+                    type_class, detection_str = EXT_META.get(file_ext, DEFAULT_EXT_META)
                     
-                    html_content += f"""
+                    parts.append(f"""
                     <tr>
                         <td title="{filename}">{filename[:40]}{'...' if len(filename) > 40 else ''}</td>
                         <td><span class="file-type {type_class}">{file_ext.upper()}</span></td>
                         <td><span class="file-size">{size_str}</span></td>
                         <td>{mod_time}</td>
                         <td><small>{detection_str}</small></td>
-                        <td><button class="open-btn" onclick="openFile('{file_path.replace(chr(92), '/')}')">Open</button></td>
+                        <td><button class="open-btn" onclick="openFile('{url_path}')">Open</button></td>
                     </tr>
-                    """
+                    """)
                     
             except Exception as e:
-                html_content += f"""
+                parts.append(f"""
                 <tr>
                     <td colspan="6" class="no-files">Error loading files: {str(e)}</td>
                 </tr>
-                """
+                """)
             
-            html_content += """
+            parts.append("""
                 </table>
             </div>
-            """
+            """)
         else:
-            html_content += """
+            parts.append("""
             <div class="no-files">
                 <h3>No monitored files found</h3>
                 <p>Files will appear here when they are detected in the download directory.</p>
             </div>
-            """
-
-        html_content += f"""
-            <div class="refresh-info">
-                🔬 Advanced Duplicate Detection Active | 📡 Auto-refresh: 30s | ⏰ Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-                <br><br>
-                <span class="total-files">Monitoring {total_files} files with multi-algorithm similarity detection</span>
-                <br><br>
-                <strong>Detection Capabilities:</strong>
-                {'✅ Image Similarity' if PIL_AVAILABLE else '❌ Image Similarity'} | 
-                {'✅ Audio Fingerprinting' if LIBROSA_AVAILABLE else '❌ Audio Fingerprinting'} | 
-                {'✅ Document Analysis' if PYMUPDF_AVAILABLE else '❌ Document Analysis'} | 
-                {'✅ Video Comparison' if CV2_AVAILABLE else '❌ Video Comparison'} | 
-                {'✅ Fuzzy Matching' if SSDEEP_AVAILABLE else '❌ Fuzzy Matching'}
-            </div>
-        </div>
-    </div>
-    
-    <script>
-        function openFile(filePath) {{
-            fetch('/open?path=' + encodeURIComponent(filePath))
-                .then(response => response.json())
-                .then(data => {{
-                    if (data.success) {{
-                        console.log('File opened successfully: ' + data.path);
-                        showMessage('File opened successfully!', 'success');
-                    }} else {{
-                        console.error('Error opening file: ' + data.message);
-                        showMessage('Error opening file: ' + data.message, 'error');
-                    }}
-                }})
-                .catch(error => {{
-                    console.error('Error: ' + error);
-                    showMessage('Network error: ' + error, 'error');
-                }});
-        }}
-        
-        function showMessage(message, type) {{
-            const msgDiv = document.createElement('div');
-            msgDiv.style.cssText = `
-                position: fixed; top: 20px; right: 20px; z-index: 1000;
-                padding: 15px 20px; border-radius: 10px; color: white; font-weight: bold;
-                background: ${{type === 'success' ? 'linear-gradient(135deg, #4CAF50, #45a049)' : 'linear-gradient(135deg, #f44336, #d32f2f)'}};
-                box-shadow: 0 5px 15px rgba(0,0,0,0.3); animation: slideIn 0.3s ease;
-            `;
-            msgDiv.textContent = message;
-            
-            const style = document.createElement('style');
-            style.textContent = `
-                @keyframes slideIn {{
-                    from {{ transform: translateX(100%); opacity: 0; }}
-                    to {{ transform: translateX(0); opacity: 1; }}
-                }}
-            `;
-            document.head.appendChild(style);
-            
-            document.body.appendChild(msgDiv);
-            setTimeout(() => {{
-                msgDiv.remove();
-                style.remove();
-            }}, 3000);
-        }}
-        
-        // Add loading animations
-        window.addEventListener('load', function() {{
-            const cards = document.querySelectorAll('.stat-card, .feature-card');
-            cards.forEach((card, index) => {{
-                setTimeout(() => {{
-                    card.style.animation = 'fadeInUp 0.6s ease forwards';
-                }}, index * 50);
-            }});
-        }});
-        
-        const fadeStyle = document.createElement('style');
-        fadeStyle.textContent = `
-            @keyframes fadeInUp {{
-                from {{ transform: translateY(30px); opacity: 0; }}
-                to {{ transform: translateY(0); opacity: 1; }}
-            }}
-        `;
-        document.head.appendChild(fadeStyle);
-    </script>
-</body>
-</html>"""
-        
-        return html_content
+            """)
+
+        html_body = ''.join(parts)
+        _cached_html = html_body
+        _cached_total_files = total_files
+        _cached_dir_mtime = dir_mtime
+        _cached_files_sig = files_sig
+        _cached_advanced_stats_sig = advanced_stats_sig
+        return html_body + render_stats_footer(total_files)
         
     except Exception as e:
         return f"""<!DOCTYPE html>
@@ -1427,6 +1990,29 @@ def generate_stats_html():
 </body>
 </html>"""
 
+def compress_stats_html(html_content):
+    """Gzip the stats page, compressing the cached body only when it has changed"""
+    global _cached_gzip_source, _cached_gzip_prefix, _cached_gzip_compressor
+    body = _cached_html
+    if body is None or not html_content.startswith(body):
+        return gzip.compress(html_content.encode('utf-8'), compresslevel=1)
+    if body is not _cached_gzip_source:
+        compressor = zlib.compressobj(1, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        _cached_gzip_prefix = compressor.compress(body.encode('utf-8'))
+        _cached_gzip_compressor = compressor
+        _cached_gzip_source = body
+    # Continue a copy of the body's compressor with the per-request footer
+    compressor = _cached_gzip_compressor.copy()
+    footer = html_content[len(body):].encode('utf-8')
+    return _cached_gzip_prefix + compressor.compress(footer) + compressor.flush()
+
+def spawn_file_opener(command, file_path):
+    """Launch an external opener for file_path without forking this process"""
+    # posix_spawnp avoids copying the page tables of a process that has the
+    # media libraries loaded; the child is reaped in the background
+    pid = os.posix_spawnp(command, [command, file_path], os.environ)
+    threading.Thread(target=os.waitpid, args=(pid, 0), daemon=True).start()
+
 class FileRequestHandler(BaseHTTPRequestHandler):
     """HTTP handler for file operations with improved error handling"""
     
@@ -1439,16 +2025,23 @@ class FileRequestHandler(BaseHTTPRequestHandler):
             parsed_path = urllib.parse.urlparse(self.path)
             
             if parsed_path.path == '/stats' or parsed_path.path == '/':
-                # Serve the enhanced statistics page
+                # Serve the enhanced statistics page, gzipped when the client accepts it
+                use_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+                with _stats_lock:
+                    html_content = generate_stats_html()
+                    body = compress_stats_html(html_content) if use_gzip else html_content.encode('utf-8')
+                
                 self.send_response(200)
                 self.send_header('Content-type', 'text/html; charset=utf-8')
+                if use_gzip:
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(body)))
                 self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
                 self.send_header('Pragma', 'no-cache')
                 self.send_header('Expires', '0')
                 self.end_headers()
                 
-                html_content = generate_stats_html()
-                self.wfile.write(html_content.encode('utf-8'))
+                self.wfile.write(body)
                 
             elif parsed_path.path == '/open':
                 # Handle file open requests
@@ -1462,7 +2055,7 @@ class FileRequestHandler(BaseHTTPRequestHandler):
                         if os.name == 'nt':  # Windows
                             os.startfile(file_path)
                         elif os.name == 'posix':  # macOS and Linux
-                            subprocess.call(('open', file_path))
+                            spawn_file_opener('open', file_path)
                         else:
                             subprocess.call(('xdg-open', file_path))
                             
@@ -1503,7 +2096,7 @@ def start_web_server():
     global web_server
     try:
         server_address = ('localhost', WEB_SERVER_PORT)
-        web_server = HTTPServer(server_address, FileRequestHandler)
+        web_server = ThreadingHTTPServer(server_address, FileRequestHandler)
         print(f"🌐 Web server started on http://localhost:{WEB_SERVER_PORT}")
         print(f"📊 View enhanced statistics at: http://localhost:{WEB_SERVER_PORT}/stats")
         web_server.serve_forever()
@@ -1524,27 +2117,37 @@ def populate_initial_hashes():
     advanced_count = 0
 
     try:
-        for filename in os.listdir(DOWNLOAD_DIR):
-            file_path = os.path.join(DOWNLOAD_DIR, filename)
-            if os.path.isfile(file_path):
-                if should_process_file(file_path):
-                    # Generate basic MD5 hash
-                    file_hash = calculate_hash(file_path)
-                    if file_hash:
-                        file_hashes[file_hash] = filename
-                        mod_db[filename] = (file_hash, str(os.path.getmtime(file_path)))
-                        print(f"📄 Added to database: {filename}")
-                        processed_count += 1
-                        
-                        # Generate advanced fingerprints
-                        try:
-                            advanced_detector.store_fingerprints(file_path)
-                            advanced_count += 1
-                            print(f"🔬 Generated advanced fingerprints for: {filename}")
-                        except Exception as e:
-                            print(f"⚠️  Could not generate advanced fingerprints for {filename}: {e}")
+        # Collect eligible files first so their hashes can be computed concurrently
+        # (one directory read; DirEntry supplies the file type and stat result)
+        eligible_files = []
+        with os.scandir(DOWNLOAD_DIR) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                stat_result = entry.stat()
+                if should_process_file(entry.path, stat_result.st_mtime_ns, stat_result.st_size):
+                    eligible_files.append((entry.name, entry.path, stat_result.st_mtime))
                 else:
                     skipped_count += 1
+        
+        # Generate basic SHA-256 hashes on a thread pool; results come back in order
+        with ThreadPoolExecutor(max_workers=HASH_WORKERS) as executor:
+            file_hash_results = executor.map(calculate_hash, [file_path for _, file_path, _ in eligible_files])
+            
+            for (filename, file_path, mtime), file_hash in zip(eligible_files, file_hash_results):
+                if file_hash:
+                    file_hashes[file_hash] = filename
+                    mod_db[filename] = (file_hash, str(mtime))
+                    print(f"📄 Added to database: {filename}")
+                    processed_count += 1
+                    
+                    # Generate advanced fingerprints
+                    try:
+                        advanced_detector.store_fingerprints(file_path)
+                        advanced_count += 1
+                        print(f"🔬 Generated advanced fingerprints for: {filename}")
+                    except Exception as e:
+                        print(f"⚠️  Could not generate advanced fingerprints for {filename}: {e}")
     except Exception as e:
         print(f"Error scanning directory: {e}")
 
@@ -1564,29 +2167,259 @@ class EnhancedDownloadHandler(FileSystemEventHandler):
     def __init__(self):
         self.file_hashes = load_existing_hashes()
         self.mod_db = load_modification_db()
-        if not self.file_hashes or not self.mod_db:
+        rescanned = not self.file_hashes or not self.mod_db
+        if rescanned:
             self.file_hashes, self.mod_db = populate_initial_hashes()
 
+        # Similar-filename index: filename_similarity_key -> {filename: number of hashes with that name}
+        self.name_index = {}
+        for file_name in self.file_hashes.values():
+            self.index_filename(file_name)
+
+        # LRU of advanced similarity results by (file path, content hash), so repeated
+        # events for an unchanged file skip the fingerprint comparison. Results exclude
+        # the queried path, so they are only valid for that path. A rescan just stored
+        # fresh fingerprints that saved results could miss, so start empty then.
+        self.similarity_cache = OrderedDict() if rescanned else load_similarity_cache()
+        self.similarity_cache_generation = advanced_detector.fingerprint_generation
+
         self.processing_files = set()
         self.file_modification_times = {}
+        
+        # Debounced event buffer: file_path -> (is_new_file, writer_closed)
+        self.pending_events = {}
+        # Files created but not yet closed by their writer, with the time of their last
+        # write activity (close-event platforms only)
+        self.created_paths = {}
+        self.pending_since = None
+        self.pending_lock = threading.Lock()
+        self.flush_timer = None
+        self.stopping = False
+        
+        # Store changes since the last write: appended every STORE_SAVE_DELAY, with the
+        # files compacted every STORE_COMPACT_THRESHOLD changes
+        self.hash_changes = []
+        self.mod_changes = []
+        self.appended_changes = 0
+        self.last_save = time.monotonic()
+        
+        # The dashboard rescans on demand, so the event path only refreshes statistics periodically
+        self.processed_events = 0
         super().__init__()
+        
+        # One worker thread processes every batch and owns file_hashes, mod_db and the
+        # indexes built on them, so none of that state needs locking
+        self.batch_queue = queue.Queue()
+        self.worker = threading.Thread(target=self.process_batches, daemon=True)
+        self.worker.start()
+
+    def index_filename(self, file_name):
+        """Add a filename to the similar-filename index"""
+        names = self.name_index.setdefault(filename_similarity_key(file_name), {})
+        names[file_name] = names.get(file_name, 0) + 1
+
+    def unindex_filename(self, file_name):
+        """Remove one occurrence of a filename from the similar-filename index"""
+        key = filename_similarity_key(file_name)
+        names = self.name_index.get(key)
+        if not names or file_name not in names:
+            return
+        names[file_name] -= 1
+        if names[file_name] == 0:
+            del names[file_name]
+            if not names:
+                del self.name_index[key]
+
+    def set_file_hash(self, file_hash, file_name):
+        """Record file_hash -> file_name, keeping the filename index in step"""
+        old_name = self.file_hashes.get(file_hash)
+        if old_name is not None:
+            self.unindex_filename(old_name)
+        self.file_hashes[file_hash] = file_name
+        self.index_filename(file_name)
+        self.hash_changes.append((file_hash, file_name))
+
+    def remove_file_hash(self, file_hash):
+        """Forget file_hash, keeping the filename index in step"""
+        self.unindex_filename(self.file_hashes.pop(file_hash))
+        self.hash_changes.append((file_hash, None))
+
+    def set_modification_entry(self, file_name, file_hash, timestamp):
+        """Record the hash and timestamp last seen for file_name"""
+        self.mod_db[file_name] = (file_hash, timestamp)
+        self.mod_changes.append((file_name, (file_hash, timestamp)))
+
+    def save_stores(self, compact=False):
+        """Write pending store changes now, rewriting the stores in full when compact or due"""
+        self.appended_changes += len(self.hash_changes) + len(self.mod_changes)
+        
+        if compact or self.appended_changes >= STORE_COMPACT_THRESHOLD:
+            save_hashes(self.file_hashes)
+            save_modification_db(self.mod_db)
+            self.appended_changes = 0
+        else:
+            if self.hash_changes:
+                append_hashes(self.hash_changes)
+            if self.mod_changes:
+                append_modification_db(self.mod_changes)
+        
+        self.hash_changes = []
+        self.mod_changes = []
+        self.last_save = time.monotonic()
+
+    def process_batches(self):
+        """Worker loop: handle queued event batches and write store changes at most every STORE_SAVE_DELAY"""
+        while True:
+            has_changes = bool(self.hash_changes or self.mod_changes)
+            try:
+                batch = self.batch_queue.get(timeout=STORE_SAVE_DELAY if has_changes else None)
+            except queue.Empty:
+                self.save_stores()
+                continue
+            
+            if batch is None:
+                # Shutdown: write everything out in full
+                self.save_stores(compact=True)
+                return
+            
+            for file_path, (is_new_file, writer_closed) in batch.items():
+                try:
+                    self.handle_file_event(file_path, is_new_file, writer_closed)
+                except Exception as e:
+                    print(f"Error handling event for {file_path}: {e}")
+            
+            # Keep saving during a long burst rather than only once it goes quiet
+            if (self.hash_changes or self.mod_changes) and time.monotonic() - self.last_save >= STORE_SAVE_DELAY:
+                self.save_stores()
+
+    def stop_worker(self):
+        """Finish pending and queued batches, save the stores and stop the worker thread"""
+        with self.pending_lock:
+            self.stopping = True
+            # Hand over events still in the debounce window so they land ahead of the sentinel
+            if self.flush_timer is not None:
+                self.flush_timer.cancel()
+                self.flush_timer = None
+            if self.pending_events:
+                self.batch_queue.put(self.pending_events)
+                self.pending_events = {}
+            self.pending_since = None
+            self.batch_queue.put(None)
+        self.worker.join()
+
+    def sync_similarity_cache(self):
+        """Drop cached similarity results once new fingerprints have been stored"""
+        if self.similarity_cache_generation != advanced_detector.fingerprint_generation:
+            # Older results could miss the newly fingerprinted files as matches
+            self.similarity_cache.clear()
+            self.similarity_cache_generation = advanced_detector.fingerprint_generation
+
+    def find_similarities(self, file_path, file_hash):
+        """Return advanced similarity results for a file, reusing cached results for the same path and content"""
+        cache_key = (file_path, file_hash)
+        self.sync_similarity_cache()
+        similarities = self.similarity_cache.get(cache_key)
+        if similarities is not None:
+            self.similarity_cache.move_to_end(cache_key)
+            return similarities
+
+        # find_all_similarities stores this file's fingerprints before querying
+        similarities = advanced_detector.find_all_similarities(file_path)
+        self.sync_similarity_cache()
+        self.similarity_cache[cache_key] = similarities
+        if len(self.similarity_cache) > SIMILARITY_CACHE_SIZE:
+            self.similarity_cache.popitem(last=False)
+        return similarities
 
     def on_created(self, event):
         if not event.is_directory:
-            time.sleep(1)
-            self.handle_file_event(event.src_path, is_new_file=True)
+            if CLOSE_EVENTS_AVAILABLE:
+                # Wait for the close event instead of polling a file that is still being written
+                with self.pending_lock:
+                    self.created_paths[event.src_path] = time.monotonic()
+                self.start_close_timeout(event.src_path, CLOSE_EVENT_TIMEOUT)
+            else:
+                self.queue_file_event(event.src_path, is_new_file=True)
+
+    def start_close_timeout(self, file_path, delay):
+        timer = threading.Timer(delay, self.check_created_path, args=(file_path,))
+        timer.daemon = True
+        timer.start()
+
+    def check_created_path(self, file_path):
+        """Stop waiting for a close event once a created file has seen no writes for CLOSE_EVENT_TIMEOUT"""
+        # Files moved in from another directory arrive as created events that are never
+        # followed by a close, so they go through the stability check instead
+        with self.pending_lock:
+            last_activity = self.created_paths.get(file_path)
+            if last_activity is None:
+                return  # Already closed and queued
+            idle = time.monotonic() - last_activity
+            if idle >= CLOSE_EVENT_TIMEOUT:
+                del self.created_paths[file_path]
+        
+        if idle < CLOSE_EVENT_TIMEOUT:
+            self.start_close_timeout(file_path, CLOSE_EVENT_TIMEOUT - idle)
+        else:
+            self.queue_file_event(file_path, is_new_file=True, writer_closed=False)
 
-    def on_moved(self, event):
+    def on_closed(self, event):
+        # Only emitted for files closed after writing, so the content is complete
         if not event.is_directory:
-            time.sleep(1)
-            self.handle_file_event(event.dest_path, is_new_file=True)
+            with self.pending_lock:
+                is_new_file = self.created_paths.pop(event.src_path, None) is not None
+            self.queue_file_event(event.src_path, is_new_file, writer_closed=True)
 
-    def on_modified(self, event):
+    def on_moved(self, event):
         if not event.is_directory:
-            time.sleep(1)
-            self.handle_file_event(event.src_path, is_new_file=False)
+            # A rename (e.g. .crdownload -> final name) happens after the download is written
+            self.queue_file_event(event.dest_path, is_new_file=True, writer_closed=CLOSE_EVENTS_AVAILABLE)
 
-    def handle_file_event(self, file_path, is_new_file):
+    def on_modified(self, event):
+        if event.is_directory:
+            return
+        if CLOSE_EVENTS_AVAILABLE:
+            # The close event will queue the file; just note that its writer is still active
+            with self.pending_lock:
+                if event.src_path in self.created_paths:
+                    self.created_paths[event.src_path] = time.monotonic()
+        else:
+            self.queue_file_event(event.src_path, is_new_file=False)
+
+    def queue_file_event(self, file_path, is_new_file, writer_closed=False):
+        """Buffer an event and restart the debounce timer so bursts are processed as one batch"""
+        with self.pending_lock:
+            if self.stopping:
+                return  # The worker has been told to stop; nothing would process this event
+            was_new, was_closed = self.pending_events.get(file_path, (False, False))
+            self.pending_events[file_path] = (was_new or is_new_file, was_closed or writer_closed)
+            
+            now = time.monotonic()
+            if self.pending_since is None:
+                self.pending_since = now
+            
+            # Keep postponing while events arrive, but never past the maximum batch delay
+            if self.flush_timer and now - self.pending_since < EVENT_MAX_BATCH_DELAY:
+                self.flush_timer.cancel()
+                self.flush_timer = None
+            
+            if self.flush_timer is None:
+                self.flush_timer = threading.Timer(EVENT_DEBOUNCE_SECONDS, self.flush_pending_events)
+                self.flush_timer.daemon = True
+                self.flush_timer.start()
+
+    def flush_pending_events(self):
+        """Hand all buffered events to the worker thread as a single batch"""
+        with self.pending_lock:
+            batch = self.pending_events
+            self.pending_events = {}
+            self.pending_since = None
+            self.flush_timer = None
+            # Enqueue under the lock so a batch can never land behind stop_worker's sentinel
+            if batch:
+                self.batch_queue.put(batch)
+
+    def handle_file_event(self, file_path, is_new_file, writer_closed=False):
         file_name = os.path.basename(file_path)
 
         if not should_process_file(file_path):
@@ -1604,13 +2437,14 @@ class EnhancedDownloadHandler(FileSystemEventHandler):
         self.file_modification_times[file_path] = current_time
 
         # Process the file with enhanced detection
-        self.monitor_and_process_file(file_path, is_new_file)
+        self.monitor_and_process_file(file_path, is_new_file, writer_closed)
 
-    def monitor_and_process_file(self, file_path, is_new_file):
+    def monitor_and_process_file(self, file_path, is_new_file, writer_closed=False):
         file_name = os.path.basename(file_path)
 
         try:
-            if not self.wait_for_stable_file(file_path):
+            # A close or rename event already proves the writer is finished
+            if not writer_closed and not self.wait_for_stable_file(file_path):
                 return
 
             # Calculate basic hash
@@ -1623,8 +2457,10 @@ class EnhancedDownloadHandler(FileSystemEventHandler):
             else:
                 self.check_for_modifications(file_path, file_name, file_hash)
 
-            # Update file type statistics after processing
-            update_file_type_stats()
+            # Update file type statistics every STATS_REFRESH_EVENTS processed files
+            self.processed_events += 1
+            if self.processed_events % STATS_REFRESH_EVENTS == 0:
+                update_file_type_stats()
 
         except Exception as e:
             print(f"Error processing {file_name}: {e}")
@@ -1671,12 +2507,13 @@ class EnhancedDownloadHandler(FileSystemEventHandler):
                 original_path = os.path.join(DOWNLOAD_DIR, original_name)
                 show_alert(f"Exact duplicate: '{file_name}' matches '{original_name}'", is_error=True)
                 show_enhanced_modal_alert(file_path, original_path, "Exact Content Match", 1.0)
-                duplicates_found = True
+                # Identical content: name and fingerprint checks can't add anything
+                return
 
-        # Check filename similarity (existing functionality)
+        # Check filename similarity (existing functionality); only names sharing the key can match
         if not duplicates_found:
-            for existing_hash, existing_name in self.file_hashes.items():
-                if existing_name != file_name and is_similar_filename(file_name, existing_name):
+            for existing_name in self.name_index.get(filename_similarity_key(file_name), ()):
+                if existing_name != file_name:
                     existing_path = os.path.join(DOWNLOAD_DIR, existing_name)
                     show_alert(f"Similar filename: '{file_name}' resembles '{existing_name}'", is_error=True)
                     show_enhanced_modal_alert(file_path, existing_path, "Similar Filename", 0.8)
@@ -1686,7 +2523,7 @@ class EnhancedDownloadHandler(FileSystemEventHandler):
         # Advanced similarity detection
         if not duplicates_found:
             print(f"🔬 Running advanced similarity analysis for: {file_name}")
-            similarities = advanced_detector.find_all_similarities(file_path)
+            similarities = self.find_similarities(file_path, file_hash)
             
             for similarity_type, similar_files in similarities.items():
                 if similar_files:  # If any similar files found
@@ -1714,10 +2551,8 @@ class EnhancedDownloadHandler(FileSystemEventHandler):
         if not duplicates_found:
             show_alert(f"New unique file: {file_name}")
             # Add to hash database
-            self.file_hashes[file_hash] = file_name
-            self.mod_db[file_name] = (file_hash, str(os.path.getmtime(file_path)))
-            save_hashes(self.file_hashes)
-            save_modification_db(self.mod_db)
+            self.set_file_hash(file_hash, file_name)
+            self.set_modification_entry(file_name, file_hash, str(os.path.getmtime(file_path)))
             
             # Store advanced fingerprints for future comparisons
             try:
@@ -1752,7 +2587,7 @@ class EnhancedDownloadHandler(FileSystemEventHandler):
 
             # Check if the new content matches any existing files using advanced detection
             print(f"🔄 Analyzing modified file: {file_name}")
-            similarities = advanced_detector.find_all_similarities(file_path)
+            similarities = self.find_similarities(file_path, current_hash)
             
             match_found = False
             for similarity_type, similar_files in similarities.items():
@@ -1776,15 +2611,13 @@ class EnhancedDownloadHandler(FileSystemEventHandler):
                     break
 
             # Update the modification database
-            self.mod_db[file_name] = (current_hash, str(os.path.getmtime(file_path)))
-            save_modification_db(self.mod_db)
+            self.set_modification_entry(file_name, current_hash, str(os.path.getmtime(file_path)))
 
             # Update the hash database
             for h, name in list(self.file_hashes.items()):
                 if name == file_name and h != current_hash:
-                    del self.file_hashes[h]
-            self.file_hashes[current_hash] = file_name
-            save_hashes(self.file_hashes)
+                    self.remove_file_hash(h)
+            self.set_file_hash(current_hash, file_name)
             
             # Update advanced fingerprints
             try:
@@ -1805,14 +2638,14 @@ def start_monitoring():
     print(f"🌐 Web server port: {WEB_SERVER_PORT}")
     print()
     print("🔍 ADVANCED DETECTION FEATURES:")
-    print(f"   {'✅' if PIL_AVAILABLE else '❌'} Image similarity detection (Perceptual hashing)")
+    print(f"   {'✅' if IMAGE_HASH_AVAILABLE else '❌'} Image similarity detection (Perceptual hashing)")
     print(f"   {'✅' if LIBROSA_AVAILABLE else '❌'} Audio fingerprinting (MFCC + spectral analysis)")  
     print(f"   {'✅' if PYMUPDF_AVAILABLE else '❌'} Document content analysis (OCR + text comparison)")
     print(f"   {'✅' if CV2_AVAILABLE else '❌'} Video thumbnail comparison")
     print(f"   {'✅' if SSDEEP_AVAILABLE else '❌'} Fuzzy hash matching (ssdeep)")
     print()
     print("🔧 TRADITIONAL FEATURES:")
-    print("   ✅ MD5 content duplicate detection")
+    print("   ✅ SHA-256 content duplicate detection")
     print("   ✅ Similar filename detection")
     print("   ✅ File modification tracking")
     print("   ✅ Enhanced modal alerts with similarity scores")
@@ -1856,13 +2689,15 @@ def start_monitoring():
         except:
             pass
 
-        # Keep the monitor running
+        # Keep the monitor running and show alerts raised by the watcher threads
         while True:
-            time.sleep(1)
+            process_pending_alerts()
+            time.sleep(0.2)
 
     except KeyboardInterrupt:
         print("\n🛑 Stopping enhanced monitor...")
         observer.stop()
+        event_handler.stop_worker()
         advanced_detector.close_database()
         if web_server:
             web_server.shutdown()
@@ -1871,12 +2706,14 @@ def start_monitoring():
     except Exception as e:
         print(f"❌ Error: {e}")
         observer.stop()
+        event_handler.stop_worker()
         advanced_detector.close_database()
         if web_server:
             web_server.shutdown()
 
     finally:
         observer.join()
+        save_similarity_cache(event_handler.similarity_cache)
 
 def cleanup_temp_files():
     """Clean up temporary files"""
@@ -1995,7 +2832,7 @@ COMMANDS:
        • Works across all file types
 
 🔧 TRADITIONAL FEATURES:
-    ✅ MD5 hash duplicate detection
+    ✅ SHA-256 hash duplicate detection
     ✅ Smart filename similarity detection
     ✅ File modification tracking with change detection
     ✅ Enhanced modal alerts with similarity scores
@@ -2041,7 +2878,7 @@ COMMANDS:
     3. Start monitoring: python enhanced_download_monitor.py start
 
 🔍 HOW IT WORKS:
-    1. Traditional MD5 hashing for exact duplicates
+    1. Traditional SHA-256 hashing for exact duplicates
     2. Advanced fingerprinting for similarity detection
     3. Multi-algorithm comparison with confidence scores
     4. SQLite database stores all fingerprints
@@ -1,19 +1,137 @@
 import os
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from difflib import SequenceMatcher
 
+try:
+    import xxhash  # Fast non-cryptographic hash; only used as a dedup key here
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    from rapidfuzz.distance import Indel  # Bit-parallel LCS with early exit below a cutoff
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+HASH_BLOCK_SIZE = 1024 * 1024   # Files up to this size are hashed from a single read
+PARTIAL_HASH_SIZE = 64 * 1024  # Leading bytes hashed to split same-size candidates cheaply
+
+def new_hasher():
+    """Return a fresh content hasher (xxh3_64 if available, else SHA-256)."""
+    return xxhash.xxh3_64() if XXHASH_AVAILABLE else hashlib.sha256()
+
 def calculate_hash(file_path):
-    """Calculate the SHA-256 hash of the file."""
-    sha256_hash = hashlib.sha256()
+    """Calculate the content hash of the file."""
+    hasher = new_hasher()
     with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
+        if os.fstat(f.fileno()).st_size <= HASH_BLOCK_SIZE:
+            # Small files are hashed from a single read
+            hasher.update(f.read())
+            return hasher.hexdigest()
+        
+        # Read into one reused buffer instead of allocating a bytes object per block.
+        # (Not mmap: a file truncated while being hashed would raise an uncatchable SIGBUS.)
+        buffer = bytearray(HASH_BLOCK_SIZE)
+        view = memoryview(buffer)
+        while True:
+            bytes_read = f.readinto(buffer)
+            if not bytes_read:
+                break
+            hasher.update(view[:bytes_read])
+    return hasher.hexdigest()
+
+def calculate_partial_hash(file_path):
+    """Calculate the content hash of the first PARTIAL_HASH_SIZE bytes of the file."""
+    hasher = new_hasher()
+    with open(file_path, "rb") as f:
+        hasher.update(f.read(PARTIAL_HASH_SIZE))
+    return hasher.hexdigest()
+
+def hash_files(executor, paths, hash_func):
+    """Hash paths concurrently, returning {path: hash} and skipping unreadable files."""
+    def safe_hash(path):
+        try:
+            return hash_func(path)
+        except (IOError, OSError):
+            return None  # Skip unreadable files
+    
+    # hashlib releases the GIL while hashing, so the threads run on separate cores
+    return {path: file_hash for path, file_hash in zip(paths, executor.map(safe_hash, paths))
+            if file_hash is not None}
+
+def group_by(paths, keys):
+    """Bucket paths by their entry in keys, skipping paths without one."""
+    groups = {}
+    for path in paths:
+        if path in keys:
+            groups.setdefault(keys[path], []).append(path)
+    return groups
+
+def scan_files(directory):
+    """Yield (path, size) for every file under directory, using scandir's cached entry data."""
+    pending_dirs = [directory]
+    while pending_dirs:
+        try:
+            with os.scandir(pending_dirs.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending_dirs.append(entry.path)
+                        elif entry.is_file():
+                            yield entry.path, entry.stat().st_size
+                    except OSError:
+                        continue  # Skip entries that vanish or can't be stat'ed
+        except OSError:
+            continue  # Skip unreadable directories
 
-def name_similarity(name1, name2):
-    """Calculate similarity ratio between two filenames (without extension)."""
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _lcs_length(a, b):
+        """Length of the longest common subsequence of two code point arrays."""
+        previous = np.zeros(len(b) + 1, dtype=np.int32)
+        current = np.zeros(len(b) + 1, dtype=np.int32)
+        for i in range(len(a)):
+            for j in range(len(b)):
+                if a[i] == b[j]:
+                    current[j + 1] = previous[j] + 1
+                else:
+                    current[j + 1] = max(previous[j + 1], current[j])
+            previous, current = current, previous
+        return previous[len(b)]
+
+    def _code_points(text):
+        return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+    # Compile at import so the first comparison isn't slowed by JIT compilation
+    _lcs_length(_code_points("warmup"), _code_points("warm up"))
+
+def name_similarity(name1, name2, score_cutoff=None):
+    """
+    Calculate similarity ratio between two filenames (without extension).
+    
+    With score_cutoff, any ratio below it may be reported as 0.0, which lets the
+    comparison stop early for clearly different names.
+    """
     name1_base = os.path.splitext(name1)[0]
     name2_base = os.path.splitext(name2)[0]
+    if RAPIDFUZZ_AVAILABLE:
+        # Indel similarity is 2*LCS/total, the same scale as SequenceMatcher.ratio()
+        return Indel.normalized_similarity(name1_base, name2_base, score_cutoff=score_cutoff)
+    if NUMBA_AVAILABLE:
+        # Same 2*matches/total scale as SequenceMatcher.ratio(), with matches from the LCS
+        total_length = len(name1_base) + len(name2_base)
+        if total_length == 0:
+            return 1.0
+        return 2.0 * _lcs_length(_code_points(name1_base), _code_points(name2_base)) / total_length
     return SequenceMatcher(None, name1_base, name2_base).ratio()
 
 def find_duplicates(directory, check_name_similarity=False, name_similarity_threshold=0.8):
@@ -28,28 +146,38 @@ def find_duplicates(directory, check_name_similarity=False, name_similarity_thre
     Returns:
         List of duplicate file groups.
     """
+    # First pass: group files by size; a file with a unique size can't have a duplicate
+    size_groups = {}
+    for file_path, file_size in scan_files(directory):
+        # Ignore empty files without opening them
+        if file_size == 0:
+            continue
+        size_groups.setdefault(file_size, []).append(file_path)
+    
+    # Second pass: only same-size files are hashed, first their leading bytes and
+    # then, for those still colliding, the full content. Each stage hashes all of
+    # its files on one thread pool.
+    same_size_groups = [(file_size, paths) for file_size, paths in size_groups.items() if len(paths) > 1]
     file_hashes = {}
-    empty_file_hash = 'e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855'
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        partial_hashes = hash_files(executor, [path for file_size, paths in same_size_groups
+                                               if file_size > PARTIAL_HASH_SIZE for path in paths],
+                                    calculate_partial_hash)
+        
+        candidates = []
+        for file_size, paths in same_size_groups:
+            if file_size > PARTIAL_HASH_SIZE:
+                candidates.extend(group for group in group_by(paths, partial_hashes).values() if len(group) > 1)
+            else:
+                candidates.append(paths)  # The partial hash would read the whole file anyway
+        
+        full_hashes = hash_files(executor, [path for group in candidates for path in group], calculate_hash)
     
-    # First pass: group files by content hash
-    for root, _, files in os.walk(directory):
-        for file_name in files:
-            file_path = os.path.join(root, file_name)
-            
-            try:
-                file_hash = calculate_hash(file_path)
-            except (IOError, OSError):
-                continue  # Skip unreadable files
-            
-            # Ignore empty files
-            if file_hash == empty_file_hash:
-                continue
-            
-            if file_hash not in file_hashes:
-                file_hashes[file_hash] = []
-            file_hashes[file_hash].append(file_path)
+    for group in candidates:
+        for file_hash, hash_paths in group_by(group, full_hashes).items():
+            file_hashes.setdefault(file_hash, []).extend(hash_paths)
     
-    # Second pass: filter groups with duplicates
+    # Third pass: filter groups with duplicates
     duplicate_groups = [paths for paths in file_hashes.values() if len(paths) > 1]
     
     # If not checking name similarity, return all content duplicates
@@ -75,7 +203,7 @@ def find_duplicates(directory, check_name_similarity=False, name_similarity_thre
                     continue
                     
                 name2 = os.path.basename(path2)
-                similarity = name_similarity(name1, name2)
+                similarity = name_similarity(name1, name2, score_cutoff=name_similarity_threshold)
                 
                 if similarity >= name_similarity_threshold:
                     current_group.append(path2)